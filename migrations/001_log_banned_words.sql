@@ -0,0 +1,24 @@
+-- Normalized banned-word fact table for statistics.
+-- One row per (message, banned word); the (chat_id, timestamp) index backs
+-- the half-open date range scans of /statistics.
+
+CREATE TABLE IF NOT EXISTS `log_banned_words` (
+  `chat_id` bigint NOT NULL,
+  `message_id` bigint NOT NULL,
+  `user_id` bigint DEFAULT NULL,
+  `username` varchar(255) NOT NULL,
+  `timestamp` timestamp NOT NULL,
+  `word` varchar(255) NOT NULL,
+  PRIMARY KEY (`chat_id`,`message_id`,`word`),
+  KEY `chat_timestamp` (`chat_id`,`timestamp`),
+  CONSTRAINT `log_banned_words_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Backfill from the JSON column of existing log rows.
+-- INSERT IGNORE makes the migration safe to re-run.
+INSERT IGNORE INTO `log_banned_words` (chat_id, message_id, user_id, username, timestamp, word)
+SELECT l.chat_id, l.message_id, l.user_id, l.username, l.timestamp, bw.word
+FROM logs l
+JOIN JSON_TABLE(l.banned_words, '$[*]' COLUMNS(word VARCHAR(255) PATH '$')) bw
+WHERE l.chat_id IS NOT NULL
+  AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0;
@@ -0,0 +1,60 @@
+-- Per-chat, per-day statistics rollups, incremented by add_messages().
+-- /statistics merges these day buckets instead of aggregating raw logs.
+-- Requires 001_log_banned_words.sql.
+
+CREATE TABLE IF NOT EXISTS `stats_daily_users` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `user_id` bigint NOT NULL,
+  `username` varchar(255) NOT NULL,
+  `messages` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`,`user_id`),
+  CONSTRAINT `stats_daily_users_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `stats_daily_words` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `word` varchar(255) NOT NULL,
+  `uses` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`,`word`),
+  CONSTRAINT `stats_daily_words_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `stats_daily_top_message` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `message_id` bigint NOT NULL,
+  `banned_count` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`),
+  CONSTRAINT `stats_daily_top_message_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Backfill from the fact table. Buckets are overwritten with the recomputed
+-- totals, so the migration is safe to re-run.
+INSERT INTO `stats_daily_users` (chat_id, day, user_id, username, messages)
+SELECT * FROM (
+  SELECT chat_id, DATE(timestamp) AS day, COALESCE(user_id, 0) AS user_id,
+         MAX(username) AS username, COUNT(DISTINCT message_id) AS messages
+  FROM log_banned_words
+  GROUP BY chat_id, DATE(timestamp), COALESCE(user_id, 0)
+) t
+ON DUPLICATE KEY UPDATE username = t.username, messages = t.messages;
+
+INSERT INTO `stats_daily_words` (chat_id, day, word, uses)
+SELECT * FROM (
+  SELECT chat_id, DATE(timestamp) AS day, word, COUNT(*) AS uses
+  FROM log_banned_words
+  GROUP BY chat_id, DATE(timestamp), word
+) t
+ON DUPLICATE KEY UPDATE uses = t.uses;
+
+INSERT INTO `stats_daily_top_message` (chat_id, day, message_id, banned_count)
+SELECT chat_id, day, message_id, banned_count FROM (
+  SELECT chat_id, DATE(timestamp) AS day, message_id, COUNT(*) AS banned_count,
+         ROW_NUMBER() OVER (PARTITION BY chat_id, DATE(timestamp) ORDER BY COUNT(*) DESC, message_id) AS rn
+  FROM log_banned_words
+  GROUP BY chat_id, DATE(timestamp), message_id
+) t
+WHERE t.rn = 1
+ON DUPLICATE KEY UPDATE message_id = t.message_id, banned_count = t.banned_count;
@@ -0,0 +1,16 @@
+-- Unique (chat_id, word) index for the words table.
+--
+-- Existing duplicates must be removed first. On a live database prefer
+--   python src/main.py --migrate words
+-- which deletes them in small batches and then runs the ALTER below.
+-- Running this file instead deduplicates in one statement.
+
+DELETE w FROM words w
+JOIN (
+  SELECT chat_id, word, MIN(id) AS keep_id
+  FROM words
+  GROUP BY chat_id, word
+  HAVING COUNT(*) > 1
+) d ON d.chat_id = w.chat_id AND d.word = w.word AND w.id <> d.keep_id;
+
+ALTER TABLE words ADD UNIQUE KEY chat_word (chat_id, word), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,16 @@
+-- Rekey logs by (chat_id, message_id): Telegram message IDs are only unique per chat.
+-- Adds a (chat_id, timestamp) index for per-chat time range reads.
+--
+-- This rebuilds the table and blocks writes to logs while it runs.
+-- On a live database prefer
+--   python src/main.py --migrate logs
+-- which copies the table in batches while the bot keeps writing.
+
+DELETE FROM logs WHERE chat_id IS NULL;
+
+ALTER TABLE logs
+  MODIFY `chat_id` bigint NOT NULL,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (`chat_id`,`message_id`),
+  ADD KEY `chat_timestamp` (`chat_id`,`timestamp`),
+  DROP KEY `chat_id`;
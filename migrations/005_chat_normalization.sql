@@ -0,0 +1,4 @@
+-- Per-chat text normalization profile used for banned word matching:
+-- basic, standard or strict (see src/matching/normalize.py).
+
+ALTER TABLE chats ADD COLUMN `normalization` varchar(16) NOT NULL DEFAULT 'basic', ALGORITHM=INSTANT;
@@ -0,0 +1,26 @@
+-- Shared, named blocklists that chats subscribe to with /word subscribe.
+-- Each list is stored once; chat_blocklists only links chats to lists.
+
+CREATE TABLE IF NOT EXISTS `blocklists` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `name` varchar(64) NOT NULL,
+  `created_by` bigint DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `name` (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `blocklist_words` (
+  `blocklist_id` int NOT NULL,
+  `word` varchar(255) NOT NULL,
+  PRIMARY KEY (`blocklist_id`,`word`),
+  CONSTRAINT `blocklist_words_ibfk_1` FOREIGN KEY (`blocklist_id`) REFERENCES `blocklists` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `chat_blocklists` (
+  `chat_id` bigint NOT NULL,
+  `blocklist_id` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`blocklist_id`),
+  KEY `blocklist_id` (`blocklist_id`),
+  CONSTRAINT `chat_blocklists_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `chat_blocklists_ibfk_2` FOREIGN KEY (`blocklist_id`) REFERENCES `blocklists` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -0,0 +1,4 @@
+-- Per-chat fuzzy matching: banned words also match with up to
+-- fuzzy_distance typos (0 = exact matching only), set with /word fuzzy.
+
+ALTER TABLE chats ADD COLUMN `fuzzy_distance` tinyint NOT NULL DEFAULT '0', ALGORITHM=INSTANT;
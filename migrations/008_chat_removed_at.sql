@@ -0,0 +1,5 @@
+-- Removal mark of chats the bot was removed from. Set when the teardown
+-- starts, cleared when the bot is added back (which stops the teardown);
+-- chats still marked at startup have their teardown resumed.
+
+ALTER TABLE chats ADD COLUMN `removed_at` timestamp(6) NULL DEFAULT NULL, ALGORITHM=INSTANT;
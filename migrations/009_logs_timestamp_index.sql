@@ -0,0 +1,4 @@
+-- Lets --migrate db stream all chats in (timestamp, message_id) order from
+-- the index instead of sorting the whole table first.
+
+ALTER TABLE logs ADD KEY `timestamp_message` (`timestamp`, `message_id`), ALGORITHM=INPLACE, LOCK=NONE;
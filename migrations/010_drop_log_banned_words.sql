@@ -0,0 +1,6 @@
+-- log_banned_words was only the source of the stats_daily_* backfill in
+-- 002_stats_daily_rollups.sql; statistics are read from the rollups since,
+-- so the per-word copy of every logged message is no longer written.
+-- Apply after 002 and once no older bot version is running.
+
+DROP TABLE IF EXISTS `log_banned_words`;
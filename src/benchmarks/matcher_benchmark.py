@@ -0,0 +1,61 @@
+"""
+Benchmark banned word matching engines against the original set-lookup path
+
+Usage (from the src directory):
+    python -m benchmarks.matcher_benchmark [--messages N] [--repeat N]
+"""
+import re
+import random
+import string
+import argparse
+import timeit
+from matching.engines import ENGINES, compile_matcher
+
+def legacy_find(text: str, banned_words: list[str]) -> list[str]:
+    """Original check_message matching: tokenize, then loop over every banned word."""
+    message = re.sub(r"[^\w\s']", ' ', text)
+    message_words = set(message.lower().split())
+    return [word for word in banned_words if word.lower() in message_words]
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+def make_messages(rng: random.Random, vocabulary: list[str], banned: list[str], count: int) -> list[str]:
+    messages = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(5, 40))
+        if banned and rng.random() < 0.1:
+            words[rng.randrange(len(words))] = rng.choice(banned)
+        messages.append(' '.join(words) + rng.choice(['.', '!', '?', '']))
+    return messages
+
+def run(list_sizes: list[int], message_count: int, repeat: int) -> None:
+    rng = random.Random(42)
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    print(f"{'words':>7} {'engine':>10} {'us/message':>12}")
+    for size in list_sizes:
+        banned = sorted({random_word(rng) for _ in range(size)})
+        messages = make_messages(rng, vocabulary, banned, message_count)
+
+        def bench(find) -> float:
+            seconds = min(timeit.repeat(lambda: [find(m) for m in messages], number=1, repeat=repeat))
+            return seconds / message_count * 1e6
+
+        print(f"{size:>7} {'legacy':>10} {bench(lambda m: legacy_find(m, banned)):>12.2f}")
+        for engine in ENGINES:
+            matcher = compile_matcher(banned, engine)
+            print(f"{size:>7} {engine:>10} {bench(matcher.find):>12.2f}")
+        for distance in (1, 2):
+            matcher = compile_matcher(banned, distance=distance)
+            print(f"{size:>7} {f'fuzzy-{distance}':>10} {bench(matcher.find):>12.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Banned word matcher benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.messages, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,67 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
+# Database connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # Maximum open connections
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection
+DB_POOL_MAX_LIFETIME = int(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))  # Recycle connections after N seconds
+DB_POOL_PING_INTERVAL = int(os.getenv("DB_POOL_PING_INTERVAL", "30"))  # Ping connections idle longer than N seconds
+DB_POOL_RECONNECT_ATTEMPTS = int(os.getenv("DB_POOL_RECONNECT_ATTEMPTS", "3"))
+DB_POOL_RECONNECT_DELAY = float(os.getenv("DB_POOL_RECONNECT_DELAY", "1"))
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))  # Threads running async DB calls
+
+# Cache settings
+BANNED_WORDS_CACHE_SIZE = int(os.getenv("BANNED_WORDS_CACHE_SIZE", "10000"))  # Chats with cached word lists
+BLOCKLIST_CACHE_SIZE = int(os.getenv("BLOCKLIST_CACHE_SIZE", "1000"))  # Shared blocklists kept in memory
+CHAT_SETTINGS_CACHE_SIZE = int(os.getenv("CHAT_SETTINGS_CACHE_SIZE", "10000"))  # Chats with cached settings
+CHAT_SETTINGS_CACHE_TTL = float(os.getenv("CHAT_SETTINGS_CACHE_TTL", "300"))  # Seconds before settings are reloaded
+PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", "100000"))  # Cached (chat, user) moderator flags
+PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", "600"))  # Seconds before flags are reloaded
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "100000"))  # Cached match results of recently seen texts
+
+# Largest word list accepted by /word import
+WORD_IMPORT_MAX_BYTES = int(os.getenv("WORD_IMPORT_MAX_BYTES", "1048576"))
+
+# Banned word matching engine: "auto", "automaton" (phrases and wildcards) or "set" (whole words only)
+MATCHER_ENGINE = os.getenv("MATCHER_ENGINE", "auto")
+
+# Fuzzy matching, enabled per chat with /word fuzzy
+FUZZY_MIN_LENGTH = int(os.getenv("FUZZY_MIN_LENGTH", "5"))  # Shortest banned word matched with 1 typo
+FUZZY_MIN_LENGTH_2 = int(os.getenv("FUZZY_MIN_LENGTH_2", "8"))  # Shortest banned word matched with 2 typos
+FUZZY_MIN_LENGTHS = (FUZZY_MIN_LENGTH, FUZZY_MIN_LENGTH_2)
+FUZZY_MAX_DISTANCE = len(FUZZY_MIN_LENGTHS)  # Largest edit distance a chat may choose
+
+# Batched writer for the logs table
+LOG_SINK_BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", "500"))  # Rows per multi-row INSERT
+LOG_SINK_FLUSH_INTERVAL = float(os.getenv("LOG_SINK_FLUSH_INTERVAL", "1"))  # Max seconds a row waits
+LOG_SINK_QUEUE_SIZE = int(os.getenv("LOG_SINK_QUEUE_SIZE", "10000"))  # Queued rows before handlers wait
+LOG_SINK_RETRY_ATTEMPTS = int(os.getenv("LOG_SINK_RETRY_ATTEMPTS", "3"))  # Retries of a transient write error
+LOG_SINK_RETRY_DELAY = float(os.getenv("LOG_SINK_RETRY_DELAY", "0.5"))  # Seconds before the first retry, doubled each time
+
+# Chat teardown when the bot is removed
+TEARDOWN_CHUNK_SIZE = int(os.getenv("TEARDOWN_CHUNK_SIZE", "5000"))  # Log rows deleted per transaction
+
+# Message migrations (--migrate)
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))  # Rows per transaction
+MIGRATION_PROGRESS_INTERVAL = float(os.getenv("MIGRATION_PROGRESS_INTERVAL", "5"))  # Seconds between progress reports
+
 # Telegram settings
 TELEGRAM_BOT_API = os.getenv("TELEGRAM_BOT_API")
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "64"))  # Updates processed in parallel
 
 # Logging settings
 LOG_DIR = os.getenv("LOG_DIR", "logs")  # Default logs directory
 LOG_FILE = os.getenv("LOG_FILE", "message_log.json")  # Default log filename
 LOG_MAX_SIZE = int(os.getenv("LOG_MAX_SIZE", "10485760"))  # Default 10MB in bytes
 
+# Message log settings (line-delimited JSON, append-only)
+MESSAGE_LOG_BUFFER_SIZE = int(os.getenv("MESSAGE_LOG_BUFFER_SIZE", "65536"))  # Buffered bytes before a flush
+MESSAGE_LOG_FLUSH_INTERVAL = float(os.getenv("MESSAGE_LOG_FLUSH_INTERVAL", "1"))  # Max seconds lines stay buffered
+MESSAGE_LOG_FSYNC = os.getenv("MESSAGE_LOG_FSYNC", "interval")  # always, interval or never
+MESSAGE_LOG_FSYNC_INTERVAL = float(os.getenv("MESSAGE_LOG_FSYNC_INTERVAL", "1"))  # Seconds between fsyncs for "interval"
+MESSAGE_LOG_ROTATE_SIZE = int(os.getenv("MESSAGE_LOG_ROTATE_SIZE", str(LOG_MAX_SIZE)))  # Start a new part after N bytes
+MESSAGE_LOG_ROTATE_WHEN = os.getenv("MESSAGE_LOG_ROTATE_WHEN", "daily")  # daily or hourly
+
 # Message template settings
 DEFAULT_TEMPLATE = os.getenv("DEFAULT_TEMPLATE", "Hey, {name}, this word `{word}` is banned!") 
 
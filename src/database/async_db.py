@@ -0,0 +1,126 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import DB_EXECUTOR_WORKERS
+from database import db
+
+# Async facade over database.db
+#
+# Every helper runs the blocking mysql.connector call on a bounded thread pool,
+# so handlers can await it without stalling the event loop. The executor is
+# sized to the connection pool, so threads never queue for a connection.
+
+_executor = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Initialize and return the database thread pool.
+    If the executor is already initialized, it returns the existing instance.
+
+    Returns:
+        ThreadPoolExecutor: The database executor instance.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+    return _executor
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Run a blocking function on the database thread pool
+
+    Args:
+        func: Callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Any: Result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+def shutdown() -> None:
+    """
+    Wait for running queries, stop the executor and close pooled connections
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    db.close_pool()
+
+def _to_async(name: str):
+    """
+    Build an async wrapper for a database.db function
+
+    The function is looked up on every call, so this module can be imported
+    while database.db is still initializing.
+
+    Args:
+        name (str): Name of the function in database.db
+
+    Returns:
+        Callable: Coroutine function with the same arguments
+    """
+    async def wrapper(*args, **kwargs):
+        return await run_in_executor(getattr(db, name), *args, **kwargs)
+    wrapper.__name__ = name
+    wrapper.__qualname__ = name
+    wrapper.__doc__ = f"Async version of database.db.{name}"
+    return wrapper
+
+WORD_MAX_LENGTH = db.WORD_MAX_LENGTH
+
+def is_known_chat(chat_id: int) -> bool:
+    """In-memory check, see database.db.is_known_chat; does not need the executor."""
+    return db.is_known_chat(chat_id)
+
+load_known_chats = _to_async("load_known_chats")
+ensure_chat_exists = _to_async("ensure_chat_exists")
+add_banned_word = _to_async("add_banned_word")
+remove_banned_word = _to_async("remove_banned_word")
+add_banned_words = _to_async("add_banned_words")
+remove_banned_words = _to_async("remove_banned_words")
+filter_banned_words = _to_async("filter_banned_words")
+get_banned_words_matcher = _to_async("get_banned_words_matcher")
+find_banned_words = _to_async("find_banned_words")
+get_banned_word_set = _to_async("get_banned_word_set")
+get_banned_words = _to_async("get_banned_words")
+list_blocklists = _to_async("list_blocklists")
+create_blocklist = _to_async("create_blocklist")
+delete_blocklist = _to_async("delete_blocklist")
+add_blocklist_words = _to_async("add_blocklist_words")
+remove_blocklist_words = _to_async("remove_blocklist_words")
+subscribe_blocklist = _to_async("subscribe_blocklist")
+unsubscribe_blocklist = _to_async("unsubscribe_blocklist")
+get_chat_blocklists = _to_async("get_chat_blocklists")
+check_if_moderator = _to_async("check_if_moderator")
+new_moderator = _to_async("new_moderator")
+delete_moderator = _to_async("delete_moderator")
+list_moderators = _to_async("list_moderators")
+clear_words_by_chat = _to_async("clear_words_by_chat")
+delete_messages_change = _to_async("delete_messages_change")
+set_normalization = _to_async("set_normalization")
+set_fuzzy = _to_async("set_fuzzy")
+delete_messages_check = _to_async("delete_messages_check")
+add_message = _to_async("add_message")
+add_messages = _to_async("add_messages")
+show_messages_by_chat = _to_async("show_messages_by_chat")
+has_moderators = _to_async("has_moderators")
+get_message_template = _to_async("get_message_template")
+add_message_template = _to_async("add_message_template")
+remove_message_template = _to_async("remove_message_template")
+list_message_templates = _to_async("list_message_templates")
+delete_chat_and_moderators = _to_async("delete_chat_and_moderators")
+resume_chat_teardown = _to_async("resume_chat_teardown")
+pending_chat_teardowns = _to_async("pending_chat_teardowns")
+restore_chat = _to_async("restore_chat")
+get_chat_settings = _to_async("get_chat_settings")
+get_cache_stats = _to_async("get_cache_stats")
+get_locale = _to_async("get_locale")
+set_locale = _to_async("set_locale")
+list_locales = _to_async("list_locales")
+get_statistics = _to_async("get_statistics")
+get_statistics_full = _to_async("get_statistics_full")
+get_statistics_range = _to_async("get_statistics_range")
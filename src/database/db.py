@@ -1,13 +1,148 @@
-import mysql.connector
-from config.settings import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME
+from config.settings import (
+    DB_HOST, DB_USER, DB_PASSWORD, DB_NAME,
+    DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_MAX_LIFETIME, DB_POOL_PING_INTERVAL,
+    DB_POOL_RECONNECT_ATTEMPTS, DB_POOL_RECONNECT_DELAY, BANNED_WORDS_CACHE_SIZE,
+    MATCHER_ENGINE, CHAT_SETTINGS_CACHE_SIZE, CHAT_SETTINGS_CACHE_TTL,
+    PERMISSION_CACHE_SIZE, PERMISSION_CACHE_TTL, TEARDOWN_CHUNK_SIZE, VERDICT_CACHE_SIZE,
+    BLOCKLIST_CACHE_SIZE, FUZZY_MAX_DISTANCE
+)
 import random
 import json
+import hashlib
+import unicodedata
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, NamedTuple
 from utils.logger import log_system_event
 from languages.language_core import get_locales_list
+from database.pool import ConnectionPool, is_connection_error
+from utils.cache import LRUCache
+from matching.engines import Matcher, get_shared_matcher
+from matching.normalize import DEFAULT_PROFILE, PROFILES
+from utils.templates import TemplateError, compile_template
+
+_pool = None
+
+# Banned words and compiled matcher per chat: chat_id -> ChatWords.
+# Kept in sync by the word write functions (write-through).
+# Chats with identical word lists and subscriptions share one matcher (see _combined_matcher).
+_banned_words_cache = LRUCache(BANNED_WORDS_CACHE_SIZE)
+
+# Shared blocklists: blocklist_id -> Blocklist, each list held once for all subscribed chats.
+# Dropped, together with the entries of subscribed chats, when a list changes.
+_blocklist_cache = LRUCache(BLOCKLIST_CACHE_SIZE)
+
+# Match results of recently seen texts: (Matcher.version, digest of prepared text) -> tuple of words.
+# Never invalidated: a word list change switches the chat to another matcher with
+# another version, and entries of unused versions age out of the LRU.
+# Chats sharing a matcher also share its verdicts.
+_verdict_cache = LRUCache(VERDICT_CACHE_SIZE)
+
+# Moderator flags: (chat_id, user_id) -> bool, negative answers included.
+# Superadmin flags (moderator of chat 0): user_id -> bool.
+# Dropped by the moderator write functions; the TTL covers manual database edits.
+_moderator_cache = LRUCache(PERMISSION_CACHE_SIZE, ttl=PERMISSION_CACHE_TTL)
+_superadmin_cache = LRUCache(PERMISSION_CACHE_SIZE, ttl=PERMISSION_CACHE_TTL)
+
+# IDs of chats known to exist in the chats table.
+# Seeded by load_known_chats() at startup, updated when chats are created or deleted.
+_known_chats = set()
+
+# Values per IN (...) list of the bulk word functions
+BULK_CHUNK_SIZE = 1000
+
+# Longest banned word the word columns hold (varchar(255))
+WORD_MAX_LENGTH = 255
+
+class ChatSettings(NamedTuple):
+    """
+    Per-chat settings loaded in one query
+
+    Attributes:
+        locale (str): Locale of the chat
+        delete_messages (bool): Whether messages with banned words are deleted
+        templates (tuple): Tuples (template_id, CompiledTemplate) ordered by template_id
+        normalization (str): Text normalization profile used for matching
+        fuzzy (int): Typos tolerated when matching banned words, 0 for exact matching
+    """
+    locale: str
+    delete_messages: bool
+    templates: tuple
+    normalization: str = DEFAULT_PROFILE
+    fuzzy: int = 0
+
+DEFAULT_CHAT_SETTINGS = ChatSettings('en', False, ())
+
+class Blocklist(NamedTuple):
+    """
+    Shared, named list of banned words chats can subscribe to
+
+    Attributes:
+        id (int): ID of the blocklist
+        name (str): Unique name, e.g. "profanity-en"
+        words (frozenset): Words of the list
+    """
+    id: int
+    name: str
+    words: frozenset
+
+class ChatWords(NamedTuple):
+    """
+    Banned words of a chat and the matcher compiled from them
+
+    Attributes:
+        words (frozenset): The chat's own banned words
+        blocklists (tuple): Subscribed Blocklist tuples ordered by ID
+        matcher (Matcher): One matcher over the chat's words and all subscribed lists
+    """
+    words: frozenset
+    blocklists: tuple
+    matcher: Matcher
+
+# Chat settings per chat: chat_id -> ChatSettings.
+# Dropped by every function changing them; the TTL only bounds staleness
+# against changes made by other processes.
+_chat_settings_cache = LRUCache(CHAT_SETTINGS_CACHE_SIZE, ttl=CHAT_SETTINGS_CACHE_TTL)
+
+def get_pool() -> ConnectionPool:
+    """
+    Initialize and return the global connection pool.
+    If the pool is already initialized, it returns the existing instance.
+    
+    Returns:
+        ConnectionPool: The global connection pool instance.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            size=DB_POOL_SIZE,
+            max_lifetime=DB_POOL_MAX_LIFETIME,
+            timeout=DB_POOL_TIMEOUT,
+            ping_interval=DB_POOL_PING_INTERVAL,
+            reconnect_attempts=DB_POOL_RECONNECT_ATTEMPTS,
+            reconnect_delay=DB_POOL_RECONNECT_DELAY,
+            host=DB_HOST,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME
+        )
+    return _pool
+
+def close_pool() -> None:
+    """
+    Close all pooled connections
+    """
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
 
 def execute_db_query(query: str, params=None, fetch: bool = False) -> list | None:
     """
-    Execute database query with automatic connection management
+    Execute database query on a pooled connection
+    
+    Read queries that fail because the connection was lost are retried once
+    on a fresh connection. Writes are never retried.
     
     Args:
         query (str): SQL query to execute
@@ -20,51 +155,131 @@ def execute_db_query(query: str, params=None, fetch: bool = False) -> list | Non
     Raises:
         Exception: If database operation fails
     """
-    conn = None
-    cursor = None
+    # Convert single parameter to tuple
+    if params is not None and not isinstance(params, (tuple, list)):
+        params = (params,)
+
+    attempts = 2 if fetch else 1
+    for attempt in range(1, attempts + 1):
+        try:
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    if params is not None:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    if fetch:
+                        return cursor.fetchall()
+                    conn.commit()
+                    return None
+                except Exception:
+                    if conn.is_connected():
+                        conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+        except Exception as e:
+            if attempt < attempts and is_connection_error(e):
+                log_system_event(
+                    'db_retry',
+                    {'error': str(e), 'query': query},
+                    'WARNING'
+                )
+                continue
+            log_system_event(
+                'db_error',
+                {'error': str(e), 'query': query, 'params': params},
+                'ERROR'
+            )
+            raise e
+
+@contextmanager
+def transaction():
+    """
+    Context manager running several statements in one transaction on a pooled connection
+    
+    Yields a cursor; commits when the block finishes and rolls back if it raises.
+    
+    Example:
+        with transaction() as cursor:
+            cursor.execute(...)
+            cursor.executemany(...)
+    
+    Raises:
+        Exception: If database operation fails; nothing is committed then
+    """
     try:
-        conn = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
-        cursor = conn.cursor()
-        
-        if params is not None:
-            # Convert single parameter to tuple
-            if not isinstance(params, (tuple, list)):
-                params = (params,)
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-            
-        if fetch:
-            result = cursor.fetchall()
-        else:
-            conn.commit()
-            result = None
-            
-        return result
+        with get_pool().connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                if conn.is_connected():
+                    conn.rollback()
+                raise
+            finally:
+                cursor.close()
     except Exception as e:
         log_system_event(
             'db_error',
-            {'error': str(e), 'query': query, 'params': params},
+            {'error': str(e), 'query': 'transaction'},
             'ERROR'
         )
-        if conn:
-            conn.rollback()
         raise e
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+def execute_db_many(query: str, rows: list) -> None:
+    """
+    Execute a query for many parameter rows in one transaction
+    
+    INSERT statements are sent as a single multi-row INSERT.
+    
+    Args:
+        query (str): SQL query to execute
+        rows (list): List of parameter tuples
+        
+    Raises:
+        Exception: If database operation fails; nothing is committed then
+    """
+    if not rows:
+        return
+    with transaction() as cursor:
+        cursor.executemany(query, rows)
+
+def load_known_chats() -> int:
+    """
+    Seed the known-chats registry with every chat stored in the database
+    
+    Returns:
+        int: Number of known chats
+    """
+    result = execute_db_query(
+        "SELECT id FROM chats",
+        fetch=True
+    )
+    _known_chats.update(row[0] for row in result)
+    return len(_known_chats)
+
+def is_known_chat(chat_id: int) -> bool:
+    """
+    Check the known-chats registry without querying the database
+    
+    Args:
+        chat_id (int): ID of the chat
+    
+    Returns:
+        bool: True if the chat is known to exist in the database
+    """
+    return chat_id in _known_chats
 
 def ensure_chat_exists(chat_id: int, chat_name: str) -> bool:
     """
     Ensure chat exists in database, create if it doesn't.
     
+    Chats in the known-chats registry are not looked up in the database.
+    
     Args:
         chat_id (int): ID of the chat
         chat_name (str): Name of the chat
@@ -72,6 +287,8 @@ def ensure_chat_exists(chat_id: int, chat_name: str) -> bool:
     Returns:
         bool: True if chat already existed, False if it was created
     """
+    if chat_id in _known_chats:
+        return True
     result = execute_db_query(
         "SELECT 1 FROM chats WHERE id = %s",
         (chat_id,),
@@ -83,8 +300,15 @@ def ensure_chat_exists(chat_id: int, chat_name: str) -> bool:
             "INSERT IGNORE INTO chats (id, name) VALUES (%s, %s)",
             (chat_id, chat_name)
         )
+        _chat_settings_cache.pop(chat_id)
+    _known_chats.add(chat_id)
     return existed
 
+def _chunks(items: list, size: int) -> Iterator[list]:
+    """Split a list into consecutive chunks of at most size items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 def add_banned_word(word: str, chat_id: int, user_id: int, chat_name: str) -> None:
     """
     Add word to banned words list for chat
@@ -95,11 +319,55 @@ def add_banned_word(word: str, chat_id: int, user_id: int, chat_name: str) -> No
         user_id (int): ID of the user who banned the word
         chat_name (str): Name of the chat
     """
+    add_banned_words([word], chat_id, user_id, chat_name)
+
+def add_banned_words(words: Iterable[str], chat_id: int, user_id: int, chat_name: str) -> list[str]:
+    """
+    Add words to banned words list for chat with multi-row statements
+    
+    Words that are already banned are skipped, including words equal to a
+    banned one under the column collation (e.g. "café" when "cafe" is
+    banned). Words longer than WORD_MAX_LENGTH do not fit the column and
+    are skipped; callers report them. All words are inserted in one
+    transaction and the cached matcher is recompiled once for the whole batch.
+    
+    Args:
+        words (Iterable[str]): Words to ban
+        chat_id (int): ID of the chat
+        user_id (int): ID of the user who banned the words
+        chat_name (str): Name of the chat
+    
+    Returns:
+        list[str]: Lowercased words that were newly banned, in input order
+    """
+    words = list(dict.fromkeys(word.lower() for word in words if len(word) <= WORD_MAX_LENGTH))
+    if not words:
+        return []
     ensure_chat_exists(chat_id, chat_name)
-    execute_db_query(
-        "INSERT IGNORE INTO words (word, chat_id, who_banned) VALUES (%s, %s, %s)",
-        (word.lower(), chat_id, user_id)
-    )
+    added = []
+    with transaction() as cursor:
+        for chunk in _chunks(words, BULK_CHUNK_SIZE):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            select = f"SELECT word FROM words WHERE chat_id = %s AND word IN ({placeholders})"
+            cursor.execute(select, (chat_id, *chunk))
+            existing = {row[0] for row in cursor.fetchall()}
+            rows = [(word, chat_id, user_id) for word in chunk if word not in existing]
+            if not rows:
+                continue
+            # The unique (chat_id, word) key drops words equal under the column collation,
+            # so what was inserted is read back rather than assumed
+            cursor.executemany(
+                "INSERT IGNORE INTO words (word, chat_id, who_banned) VALUES (%s, %s, %s)",
+                rows
+            )
+            if cursor.rowcount == len(rows):
+                added.extend(row[0] for row in rows)
+                continue
+            cursor.execute(select, (chat_id, *chunk))
+            inserted = {row[0] for row in cursor.fetchall()} - existing
+            added.extend(row[0] for row in rows if row[0] in inserted)
+    _update_banned_words(chat_id, lambda current: current | set(added))
+    return added
 
 def remove_banned_word(word: str, chat_id: int) -> None:
     """
@@ -109,11 +377,252 @@ def remove_banned_word(word: str, chat_id: int) -> None:
         word (str): Word to remove
         chat_id (int): ID of the chat
     """
+    remove_banned_words([word], chat_id)
+
+def remove_banned_words(words: Iterable[str], chat_id: int) -> int:
+    """
+    Remove words from banned words list for chat with `DELETE ... IN` statements
+    
+    Args:
+        words (Iterable[str]): Words to remove
+        chat_id (int): ID of the chat
+    
+    Returns:
+        int: Number of deleted rows
+    """
+    words = list(dict.fromkeys(word.lower() for word in words))
+    if not words:
+        return 0
+    removed = 0
+    with transaction() as cursor:
+        for chunk in _chunks(words, BULK_CHUNK_SIZE):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"DELETE FROM words WHERE chat_id = %s AND word IN ({placeholders})",
+                (chat_id, *chunk)
+            )
+            removed += cursor.rowcount
+    _update_banned_words(chat_id, lambda current: current - set(words))
+    return removed
+
+def _combined_matcher(words: frozenset, blocklists: tuple, profile: str, distance: int) -> Matcher:
+    """
+    Get the matcher of a chat's own words and its subscribed blocklists
+
+    One matcher is compiled over the union, so a message is scanned once no
+    matter how many lists the chat subscribes to. The matcher is keyed by
+    the digest of that union, so chats with the same words and
+    subscriptions share it (see get_shared_matcher).
+    """
+    return get_shared_matcher(
+        words.union(*(blocklist.words for blocklist in blocklists)),
+        MATCHER_ENGINE, profile, distance
+    )
+
+def _update_banned_words(chat_id: int, change) -> None:
+    """
+    Recompile the cached matcher of a chat after its words were changed in the database
+    
+    The matcher is compiled outside the cache lock; if another write got in
+    first, the entry is dropped and reloaded on the next read instead.
+    
+    Args:
+        chat_id (int): ID of the chat
+        change: Callable receiving the current word set and returning the new one
+    """
+    current = _banned_words_cache.peek(chat_id)
+    if current is None:
+        # Still bump the cache so an in-flight load does not store the old words
+        _banned_words_cache.pop(chat_id)
+        return
+    words = frozenset(change(current.words))
+    matcher = _combined_matcher(words, current.blocklists, current.matcher.profile, current.matcher.distance)
+    _banned_words_cache.replace(chat_id, current, current._replace(words=words, matcher=matcher))
+
+def _collation_key(word: str) -> str:
+    """Fold a word the way the utf8mb4_0900_ai_ci column collation compares it (case and accents ignored)."""
+    decomposed = unicodedata.normalize('NFKD', word.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def filter_banned_words(chat_id: int, words: Iterable[str]) -> set[str]:
+    """
+    Get which of the given words are banned in a chat
+    
+    Answered from the cached matcher when the chat's words are in memory,
+    otherwise with an IN lookup on the unique (chat_id, word) index instead
+    of loading the whole word list. Both compare like the column collation,
+    so "café" counts as banned when "cafe" is.
+    
+    Args:
+        chat_id (int): ID of the chat
+        words (Iterable[str]): Words to check
+    
+    Returns:
+        set[str]: Lowercased words from `words` that are banned
+    """
+    words = list(dict.fromkeys(word.lower() for word in words))
+    cached = _banned_words_cache.peek(chat_id)
+    if cached is not None:
+        banned = cached.words
+    else:
+        banned = set()
+        for chunk in _chunks(words, BULK_CHUNK_SIZE):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            result = execute_db_query(
+                f"SELECT word FROM words WHERE chat_id = %s AND word IN ({placeholders})",
+                (chat_id, *chunk),
+                fetch=True
+            )
+            banned.update(row[0] for row in result)
+    keys = {_collation_key(word) for word in banned}
+    return {word for word in words if _collation_key(word) in keys}
+
+def dedup_words_batch(after_chat_id: int, batch_size: int) -> tuple[int | None, int]:
+    """
+    Delete duplicate (chat_id, word) rows of the next batch of chats, keeping the oldest row
+    
+    Args:
+        after_chat_id (int): Only chats with a larger ID are processed
+        batch_size (int): Number of chats processed in one transaction
+    
+    Returns:
+        tuple: (last processed chat ID or None when no chats are left, deleted rows)
+    """
+    chat_ids = [row[0] for row in execute_db_query(
+        "SELECT DISTINCT chat_id FROM words WHERE chat_id > %s ORDER BY chat_id LIMIT %s",
+        (after_chat_id, batch_size),
+        fetch=True
+    )]
+    if not chat_ids:
+        return None, 0
+    placeholders = ", ".join(["%s"] * len(chat_ids))
+    with transaction() as cursor:
+        cursor.execute(
+            f"""
+            DELETE w FROM words w
+            JOIN (
+                SELECT chat_id, word, MIN(id) AS keep_id
+                FROM words
+                WHERE chat_id IN ({placeholders})
+                GROUP BY chat_id, word
+                HAVING COUNT(*) > 1
+            ) d ON d.chat_id = w.chat_id AND d.word = w.word AND w.id <> d.keep_id
+            """,
+            tuple(chat_ids)
+        )
+        deleted = cursor.rowcount
+    for chat_id in chat_ids:
+        _banned_words_cache.pop(chat_id)
+    return chat_ids[-1], deleted
+
+def has_words_unique_index() -> bool:
+    """
+    Check whether the unique (chat_id, word) index of the words table exists
+    
+    Returns:
+        bool: True if the index exists
+    """
+    result = execute_db_query(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'words' AND index_name = 'chat_word'
+        LIMIT 1
+        """,
+        fetch=True
+    )
+    return bool(result)
+
+def add_words_unique_index() -> None:
+    """
+    Add the unique (chat_id, word) index to the words table without blocking writes
+    
+    Raises:
+        Exception: If duplicates were inserted since the last dedup; run it again
+    """
     execute_db_query(
-        "DELETE FROM words WHERE word = %s AND chat_id = %s",
-        (word.lower(), chat_id)
+        "ALTER TABLE words ADD UNIQUE KEY chat_word (chat_id, word), ALGORITHM=INPLACE, LOCK=NONE"
     )
 
+def get_chat_words(chat_id: int) -> ChatWords:
+    """
+    Get banned words, subscribed blocklists and compiled matcher for chat,
+    served from the in-memory cache
+    
+    The chat's words and blocklist subscriptions are loaded in one query;
+    the blocklists themselves come from the shared blocklist cache.
+    
+    Args:
+        chat_id (int): ID of the chat
+    
+    Returns:
+        ChatWords: Words, blocklists and combined matcher of the chat
+    """
+    def load() -> ChatWords:
+        result = execute_db_query(
+            """
+            SELECT word, NULL FROM words WHERE chat_id = %s
+            UNION ALL
+            SELECT NULL, blocklist_id FROM chat_blocklists WHERE chat_id = %s
+            """,
+            (chat_id, chat_id),
+            fetch=True
+        )
+        words = frozenset(word for word, _ in result if word is not None)
+        blocklists = (get_blocklist(blocklist_id) for _, blocklist_id in result if blocklist_id is not None)
+        # A list deleted meanwhile is simply skipped
+        blocklists = tuple(sorted((b for b in blocklists if b is not None), key=lambda b: b.id))
+        settings = get_chat_settings(chat_id)
+        return ChatWords(words, blocklists, _combined_matcher(words, blocklists, settings.normalization, settings.fuzzy))
+    return _banned_words_cache.get_or_load(chat_id, load)
+
+def get_banned_words_matcher(chat_id: int) -> Matcher:
+    """
+    Get compiled banned word matcher for chat, served from the in-memory cache
+    
+    Args:
+        chat_id (int): ID of the chat
+    
+    Returns:
+        Matcher: Matcher compiled from the chat's banned words and subscribed blocklists
+    """
+    return get_chat_words(chat_id).matcher
+
+def find_banned_words(chat_id: int, text: str) -> list[str]:
+    """
+    Find the banned words of a chat in a message
+    
+    Repeated texts (forwards, copy-paste spam) are answered from the verdict
+    cache, keyed by the matcher version and a hash of the normalized text,
+    so they skip matching altogether.
+    
+    Args:
+        chat_id (int): ID of the chat
+        text (str): Message text
+    
+    Returns:
+        list[str]: Matched banned words in order of first occurrence
+    """
+    matcher = get_banned_words_matcher(chat_id)
+    prepared = matcher.prepare(text)
+    key = (matcher.version, hashlib.blake2b(prepared.encode(), digest_size=16).digest())
+    verdict = _verdict_cache.get(key)
+    if verdict is None:
+        verdict = tuple(matcher.match(prepared))
+        _verdict_cache.put(key, verdict)
+    return list(verdict)
+
+def get_banned_word_set(chat_id: int) -> frozenset[str]:
+    """
+    Get set of banned words for chat, served from the in-memory cache
+    
+    Args:
+        chat_id (int): ID of the chat
+    
+    Returns:
+        frozenset[str]: Banned words for the chat, without subscribed blocklists
+    """
+    return get_chat_words(chat_id).words
+
 def get_banned_words(chat_id: int) -> list[str]:
     """
     Get list of banned words for chat
@@ -122,15 +631,237 @@ def get_banned_words(chat_id: int) -> list[str]:
         chat_id (int): ID of the chat
     
     Returns:
-        list (list[str]): List of banned words for the chat
+        list (list[str]): Sorted list of banned words for the chat
     """
+    return sorted(get_banned_word_set(chat_id))
+
+def get_blocklist(blocklist_id: int) -> Blocklist | None:
+    """
+    Get a shared blocklist, served from the in-memory cache
+    
+    Args:
+        blocklist_id (int): ID of the blocklist
+    
+    Returns:
+        Blocklist or None: The blocklist, None if it does not exist
+    """
+    def load() -> Blocklist | None:
+        result = execute_db_query(
+            """
+            SELECT b.name, w.word FROM blocklists b
+            LEFT JOIN blocklist_words w ON w.blocklist_id = b.id
+            WHERE b.id = %s
+            """,
+            blocklist_id,
+            fetch=True
+        )
+        if not result:
+            return None
+        return Blocklist(blocklist_id, result[0][0], frozenset(row[1] for row in result if row[1] is not None))
+    return _blocklist_cache.get_or_load(blocklist_id, load)
+
+def _find_blocklist_id(name: str) -> int | None:
+    """Get the ID of a blocklist by name, None if there is none."""
     result = execute_db_query(
-        "SELECT word FROM words WHERE chat_id = %s",
-        chat_id,
+        "SELECT id FROM blocklists WHERE name = %s",
+        name,
+        fetch=True
+    )
+    return result[0][0] if result else None
+
+def _blocklist_subscribers(blocklist_id: int) -> list[int]:
+    """Get the IDs of the chats subscribed to a blocklist."""
+    result = execute_db_query(
+        "SELECT chat_id FROM chat_blocklists WHERE blocklist_id = %s",
+        blocklist_id,
         fetch=True
     )
     return [row[0] for row in result]
 
+def _blocklist_changed(blocklist_id: int, subscribers: list[int] = None) -> None:
+    """
+    Drop a changed blocklist and the cached words of every chat subscribed to it
+    
+    Args:
+        blocklist_id (int): ID of the blocklist
+        subscribers (list[int]): Subscribed chats, queried if not given
+    """
+    _blocklist_cache.pop(blocklist_id)
+    if subscribers is None:
+        subscribers = _blocklist_subscribers(blocklist_id)
+    for chat_id in subscribers:
+        _banned_words_cache.pop(chat_id)
+
+def list_blocklists() -> list[tuple[str, int]]:
+    """
+    Get all shared blocklists
+    
+    Returns:
+        list[tuple[str, int]]: Tuples (name, number of words) ordered by name
+    """
+    return execute_db_query(
+        """
+        SELECT b.name, COUNT(w.word) FROM blocklists b
+        LEFT JOIN blocklist_words w ON w.blocklist_id = b.id
+        GROUP BY b.id, b.name
+        ORDER BY b.name
+        """,
+        fetch=True
+    )
+
+def create_blocklist(name: str, user_id: int) -> bool:
+    """
+    Create an empty shared blocklist
+    
+    Args:
+        name (str): Unique name of the blocklist
+        user_id (int): ID of the user who created it
+    
+    Returns:
+        bool: True if created, False if a blocklist with this name exists
+    """
+    with transaction() as cursor:
+        cursor.execute(
+            "INSERT IGNORE INTO blocklists (name, created_by) VALUES (%s, %s)",
+            (name, user_id)
+        )
+        return cursor.rowcount > 0
+
+def delete_blocklist(name: str) -> bool:
+    """
+    Delete a shared blocklist, its words and all subscriptions to it
+    
+    Args:
+        name (str): Name of the blocklist
+    
+    Returns:
+        bool: True if deleted, False if there is no such blocklist
+    """
+    blocklist_id = _find_blocklist_id(name)
+    if blocklist_id is None:
+        return False
+    # Collect the subscribers before the cascade removes them
+    subscribers = _blocklist_subscribers(blocklist_id)
+    execute_db_query(
+        "DELETE FROM blocklists WHERE id = %s",
+        blocklist_id
+    )
+    _blocklist_changed(blocklist_id, subscribers)
+    return True
+
+def add_blocklist_words(name: str, words: Iterable[str]) -> int | None:
+    """
+    Add words to a shared blocklist
+    
+    Args:
+        name (str): Name of the blocklist
+        words (Iterable[str]): Words to add
+    
+    Returns:
+        int or None: Number of newly added words, None if there is no such blocklist
+    """
+    blocklist_id = _find_blocklist_id(name)
+    if blocklist_id is None:
+        return None
+    words = list(dict.fromkeys(word.lower() for word in words))
+    added = 0
+    with transaction() as cursor:
+        for chunk in _chunks(words, BULK_CHUNK_SIZE):
+            cursor.executemany(
+                "INSERT IGNORE INTO blocklist_words (blocklist_id, word) VALUES (%s, %s)",
+                [(blocklist_id, word) for word in chunk]
+            )
+            added += cursor.rowcount
+    _blocklist_changed(blocklist_id)
+    return added
+
+def remove_blocklist_words(name: str, words: Iterable[str]) -> int | None:
+    """
+    Remove words from a shared blocklist
+    
+    Args:
+        name (str): Name of the blocklist
+        words (Iterable[str]): Words to remove
+    
+    Returns:
+        int or None: Number of removed words, None if there is no such blocklist
+    """
+    blocklist_id = _find_blocklist_id(name)
+    if blocklist_id is None:
+        return None
+    words = list(dict.fromkeys(word.lower() for word in words))
+    removed = 0
+    with transaction() as cursor:
+        for chunk in _chunks(words, BULK_CHUNK_SIZE):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"DELETE FROM blocklist_words WHERE blocklist_id = %s AND word IN ({placeholders})",
+                (blocklist_id, *chunk)
+            )
+            removed += cursor.rowcount
+    _blocklist_changed(blocklist_id)
+    return removed
+
+def subscribe_blocklist(chat_id: int, name: str, chat_name: str) -> bool | None:
+    """
+    Subscribe a chat to a shared blocklist
+    
+    Args:
+        chat_id (int): ID of the chat
+        name (str): Name of the blocklist
+        chat_name (str): Name of the chat
+    
+    Returns:
+        bool or None: True if subscribed, False if already subscribed, None if there is no such blocklist
+    """
+    blocklist_id = _find_blocklist_id(name)
+    if blocklist_id is None:
+        return None
+    ensure_chat_exists(chat_id, chat_name)
+    with transaction() as cursor:
+        cursor.execute(
+            "INSERT IGNORE INTO chat_blocklists (chat_id, blocklist_id) VALUES (%s, %s)",
+            (chat_id, blocklist_id)
+        )
+        subscribed = cursor.rowcount > 0
+    _banned_words_cache.pop(chat_id)
+    return subscribed
+
+def unsubscribe_blocklist(chat_id: int, name: str) -> bool | None:
+    """
+    Unsubscribe a chat from a shared blocklist
+    
+    Args:
+        chat_id (int): ID of the chat
+        name (str): Name of the blocklist
+    
+    Returns:
+        bool or None: True if unsubscribed, False if not subscribed, None if there is no such blocklist
+    """
+    blocklist_id = _find_blocklist_id(name)
+    if blocklist_id is None:
+        return None
+    with transaction() as cursor:
+        cursor.execute(
+            "DELETE FROM chat_blocklists WHERE chat_id = %s AND blocklist_id = %s",
+            (chat_id, blocklist_id)
+        )
+        unsubscribed = cursor.rowcount > 0
+    _banned_words_cache.pop(chat_id)
+    return unsubscribed
+
+def get_chat_blocklists(chat_id: int) -> list[str]:
+    """
+    Get the names of the blocklists a chat subscribes to
+    
+    Args:
+        chat_id (int): ID of the chat
+    
+    Returns:
+        list[str]: Sorted blocklist names
+    """
+    return sorted(blocklist.name for blocklist in get_chat_words(chat_id).blocklists)
+
 def check_if_moderator(chat_id: int, user_id: int) -> bool | int:
     """
     Check if user is a moderator in the specified chat
@@ -142,17 +873,28 @@ def check_if_moderator(chat_id: int, user_id: int) -> bool | int:
     Returns:
         bool/int: True if user is a moderator in the chat, 0 if user is superadmin, False otherwise
     """
-    result = [item[0] for item in execute_db_query(
-        "SELECT chat_id FROM user_is_moderator WHERE user_id = %s",
-        user_id,
-        fetch=True
-    )]
+    is_superadmin = _superadmin_cache.get(user_id)
+    if is_superadmin:
+        return 0
+    is_moderator = _moderator_cache.get((chat_id, user_id))
+    
+    if is_superadmin is None or is_moderator is None:
+        superadmin_epoch = _superadmin_cache.epoch
+        moderator_epoch = _moderator_cache.epoch
+        # Both flags in one indexed lookup on the (chat_id, user_id) primary key
+        result = {row[0] for row in execute_db_query(
+            "SELECT chat_id FROM user_is_moderator WHERE user_id = %s AND chat_id IN (%s, 0)",
+            (user_id, chat_id),
+            fetch=True
+        )}
+        is_superadmin = 0 in result
+        is_moderator = chat_id in result
+        _superadmin_cache.fill(user_id, is_superadmin, superadmin_epoch)
+        _moderator_cache.fill((chat_id, user_id), is_moderator, moderator_epoch)
     
-    if 0 in result:
+    if is_superadmin:
         return 0
-    if chat_id in result:
-        return True
-    return False
+    return is_moderator
 
 def new_moderator(user_id: int, username: str, chat_id: int) -> str:
     """
@@ -181,6 +923,7 @@ def new_moderator(user_id: int, username: str, chat_id: int) -> str:
         "INSERT INTO user_is_moderator (user_id, chat_id) VALUES (%s, %s)",
         (user_id, chat_id)
     )
+    _moderator_cache.pop((chat_id, user_id))
     return "added"
 
 def delete_moderator(user_id: int, chat_id: int) -> str:
@@ -207,6 +950,7 @@ def delete_moderator(user_id: int, chat_id: int) -> str:
         "DELETE FROM user_is_moderator WHERE user_id = %s AND chat_id = %s",
         (user_id, chat_id)
     )
+    _moderator_cache.pop((chat_id, user_id))
     return "removed"
 
 def list_moderators(chat_id: int) -> list:
@@ -236,6 +980,8 @@ def clear_words_by_chat(chat_id: int) -> None:
         "DELETE FROM words WHERE chat_id = %s",
         chat_id
     )
+    # Subscribed blocklists stay
+    _update_banned_words(chat_id, lambda current: frozenset())
 
 def delete_messages_change(chat_id: int, delete: bool) -> None:
     """
@@ -249,6 +995,55 @@ def delete_messages_change(chat_id: int, delete: bool) -> None:
         "UPDATE chats SET delete_messages = %s WHERE id = %s",
         (delete, chat_id)
     )
+    _chat_settings_cache.pop(chat_id)
+
+def set_normalization(chat_id: int, profile: str) -> bool:
+    """
+    Set the text normalization profile of a chat
+    
+    The chat's matcher is recompiled on the next message, since banned
+    words are normalized with the same profile as messages.
+    
+    Args:
+        chat_id (int): ID of the chat
+        profile (str): One of matching.normalize.PROFILES
+    
+    Returns:
+        bool: True if the profile was set, False if it is unknown
+    """
+    if profile not in PROFILES:
+        return False
+    execute_db_query(
+        "UPDATE chats SET normalization = %s WHERE id = %s",
+        (profile, chat_id)
+    )
+    _chat_settings_cache.pop(chat_id)
+    _banned_words_cache.pop(chat_id)
+    return True
+
+def set_fuzzy(chat_id: int, distance: int) -> bool:
+    """
+    Set how many typos a banned word may contain and still match in a chat
+    
+    The chat's matcher is recompiled on the next message with a deletion
+    index for the new distance.
+    
+    Args:
+        chat_id (int): ID of the chat
+        distance (int): Edit distance from 0 (exact matching) to FUZZY_MAX_DISTANCE
+    
+    Returns:
+        bool: True if the distance was set, False if it is out of range
+    """
+    if not 0 <= distance <= FUZZY_MAX_DISTANCE:
+        return False
+    execute_db_query(
+        "UPDATE chats SET fuzzy_distance = %s WHERE id = %s",
+        (distance, chat_id)
+    )
+    _chat_settings_cache.pop(chat_id)
+    _banned_words_cache.pop(chat_id)
+    return True
 
 def delete_messages_check(chat_id: int) -> bool:
     """
@@ -260,19 +1055,42 @@ def delete_messages_check(chat_id: int) -> bool:
     Returns:
         bool: True if delete messages is enabled, False otherwise
     """
-    result = execute_db_query(
-        "SELECT delete_messages FROM chats WHERE id = %s",
-        chat_id,
-        fetch=True
-    )
-    return result and result[0][0]
+    return get_chat_settings(chat_id).delete_messages
 
 def add_message(message_data: dict) -> None:
     """
     Add message to database
     
     Args:
-        message_data (dict): Dictionary containing message data with keys:
+        message_data (dict): Message data, see add_messages()
+    """
+    add_messages([message_data])
+
+def _message_day(timestamp) -> date:
+    """
+    Get the calendar day a logged message belongs to
+
+    Args:
+        timestamp (str | datetime): Message timestamp, ISO string or datetime
+
+    Returns:
+        date: Day of the timestamp
+    """
+    if isinstance(timestamp, datetime):
+        return timestamp.date()
+    return datetime.fromisoformat(str(timestamp)).date()
+
+def add_messages(messages: list[dict]) -> int:
+    """
+    Add messages to database with multi-row INSERTs in one transaction
+    
+    The daily statistics rollups (stats_daily_users, stats_daily_words,
+    stats_daily_top_message) are incremented in the same transaction.
+    Messages whose (chat_id, message_id) is already logged are skipped,
+    so replaying a batch never counts a message twice.
+    
+    Args:
+        messages (list[dict]): Dictionaries containing message data with keys:
             - chat_id (int): ID of the chat
             - user_id (int): ID of the user who sent the message
             - message_id (int): ID of the message
@@ -280,23 +1098,153 @@ def add_message(message_data: dict) -> None:
             - timestamp (str): Timestamp of the message in ISO format
             - username (str): Username of the user who sent the message
             - banned_words (list): List of banned words found in the message (optional)
-    """
     
-    execute_db_query(
-        """
-        INSERT INTO logs (chat_id, user_id, message_id, message_text, timestamp, username, banned_words)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            message_data["chat_id"],
-            message_data["user_id"],
-            message_data["message_id"],
-            message_data["message_text"],
-            message_data["timestamp"],
-            message_data["username"],
-            json.dumps(message_data["banned_words"]) if message_data.get("banned_words") else None
+    Returns:
+        int: Number of messages that were not logged before
+    """
+    if not messages:
+        return 0
+    with transaction() as cursor:
+        # Message IDs are only unique per chat, so rows are identified by (chat_id, message_id)
+        placeholders = ", ".join(["(%s, %s)"] * len(messages))
+        cursor.execute(
+            f"SELECT chat_id, message_id FROM logs WHERE (chat_id, message_id) IN ({placeholders})",
+            tuple(value for m in messages for value in (m["chat_id"], m["message_id"]))
         )
-    )
+        logged = {(row[0], row[1]) for row in cursor.fetchall()}
+        log_rows = []
+        # (chat_id, day, user_id) -> [username, messages]
+        user_counts = {}
+        # (chat_id, day, word) -> uses
+        word_counts = {}
+        # (chat_id, day) -> (banned_count, message_id)
+        top_messages = {}
+        for message_data in messages:
+            chat_id = message_data["chat_id"]
+            key = (chat_id, message_data["message_id"])
+            if key in logged:
+                continue
+            # Duplicates inside the batch are skipped as well
+            logged.add(key)
+            banned_words = message_data.get("banned_words") or []
+            log_rows.append((
+                chat_id,
+                message_data["user_id"],
+                message_data["message_id"],
+                message_data["message_text"],
+                message_data["timestamp"],
+                message_data["username"],
+                json.dumps(banned_words) if banned_words else None
+            ))
+            words = list(dict.fromkeys(banned_words))
+            if not words or chat_id is None:
+                continue
+            day = _message_day(message_data["timestamp"])
+            user_key = (chat_id, day, message_data["user_id"] or 0)
+            user_counts.setdefault(user_key, [message_data["username"], 0])[1] += 1
+            for word in words:
+                word_counts[(chat_id, day, word)] = word_counts.get((chat_id, day, word), 0) + 1
+            top = top_messages.get((chat_id, day))
+            if top is None or len(words) > top[0]:
+                top_messages[(chat_id, day)] = (len(words), message_data["message_id"])
+        if not log_rows:
+            return 0
+        cursor.executemany(
+            """
+            INSERT IGNORE INTO logs (chat_id, user_id, message_id, message_text, timestamp, username, banned_words)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            log_rows
+        )
+        if not word_counts:
+            return len(log_rows)
+        cursor.executemany(
+            """
+            INSERT INTO stats_daily_users (chat_id, day, user_id, username, messages)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE messages = messages + VALUES(messages), username = VALUES(username)
+            """,
+            [key + tuple(value) for key, value in user_counts.items()]
+        )
+        cursor.executemany(
+            """
+            INSERT INTO stats_daily_words (chat_id, day, word, uses)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE uses = uses + VALUES(uses)
+            """,
+            [key + (uses,) for key, uses in word_counts.items()]
+        )
+        # message_id is assigned first so it is compared against the old banned_count
+        cursor.executemany(
+            """
+            INSERT INTO stats_daily_top_message (chat_id, day, message_id, banned_count)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                message_id = IF(VALUES(banned_count) > banned_count, VALUES(message_id), message_id),
+                banned_count = GREATEST(banned_count, VALUES(banned_count))
+            """,
+            [key + (message_id, count) for key, (count, message_id) in top_messages.items()]
+        )
+    return len(log_rows)
+
+def iter_logs(since: datetime = None, until: datetime = None, chat_id: int = None, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Stream logged messages in timestamp order with an unbuffered server-side cursor
+    
+    Rows are fetched `batch_size` at a time while iterating, so memory stays
+    bounded regardless of table size. The order is read from the
+    (timestamp, message_id) index, or (chat_id, timestamp) with a chat, so
+    rows stream without a filesort. The generator holds a pooled connection
+    until it is exhausted or closed.
+    
+    Args:
+        since (datetime): Inclusive lower bound of the timestamp, None for no bound
+        until (datetime): Exclusive upper bound of the timestamp, None for no bound
+        chat_id (int): Only messages of this chat, None for all chats
+        batch_size (int): Rows fetched from the server at a time
+    
+    Yields:
+        dict: Log rows with keys chat_id, user_id, message_id, message_text,
+            timestamp (datetime), username and banned_words (list)
+    """
+    conditions = []
+    params = []
+    if chat_id is not None:
+        conditions.append("chat_id = %s")
+        params.append(chat_id)
+    if since is not None:
+        conditions.append("timestamp >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("timestamp < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    with get_pool().connection() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(
+                f"""
+                SELECT chat_id, user_id, message_id, message_text, timestamp, username, banned_words
+                FROM logs
+                {where}
+                ORDER BY timestamp, message_id
+                """,
+                tuple(params)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    row['banned_words'] = json.loads(row['banned_words']) if row['banned_words'] else []
+                    yield row
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                # Unread rows left when iteration stopped early; the pool then discards the connection
+                pass
 
 def show_messages_by_chat(chat_id: int, timestamp: str = None) -> list:
     """
@@ -358,54 +1306,70 @@ def get_message_template(chat_id: int) -> str:
     Returns:
         str: Random message template or None if no templates exist
     """
-    result = execute_db_query(
-        "SELECT template_text FROM message_templates WHERE chat_id = %s",
-        chat_id,
-        fetch=True
-    )
-    if not result:
+    templates = get_chat_settings(chat_id).templates
+    if not templates:
         return None
-    return random.choice(result)[0]
+    return random.choice(templates)[1].text
 
 def add_message_template(chat_id: int, template_text: str) -> None:
     """
     Add new message template for chat
     
+    The template is appended after the chat's last template in one statement.
+    Template numbers shown to users are derived at read time, see list_message_templates().
+    
     Args:
         chat_id (int): ID of the chat
         template_text (str): Text of the message template
     """
-    template_id = execute_db_query(
-        "SELECT MAX(template_id) FROM message_templates WHERE chat_id = %s",
-        chat_id,
-        fetch=True
-    )[0][0]
-    if template_id is not None:
-        template_id += 1
-    else:
-        template_id = 1
     execute_db_query(
-        "INSERT INTO message_templates (chat_id, template_id, template_text) VALUES (%s, %s, %s)",
-        (chat_id, template_id, template_text)
+        """
+        INSERT INTO message_templates (chat_id, template_id, template_text)
+        SELECT %s, COALESCE(MAX(template_id), 0) + 1, %s
+        FROM message_templates
+        WHERE chat_id = %s
+        """,
+        (chat_id, template_text, chat_id)
     )
+    _chat_settings_cache.pop(chat_id)
 
-def remove_message_template(chat_id: int, template_id: int) -> None:
+def remove_message_template(chat_id: int, template_id: int) -> bool:
     """
     Remove message template
     
     Args:
         chat_id (int): ID of the chat
-        template_id (int): ID of the template to remove
+        template_id (int): Number of the template as shown by list_message_templates()
+    
+    Returns:
+        bool: True if a template was removed
     """
-    execute_db_query(
-        "DELETE FROM message_templates WHERE template_id = %s AND chat_id = %s",
-        (template_id, chat_id)
-    )
+    # The ordinal is resolved and the row deleted in one statement, so there is
+    # no window in which another moderator's change could shift the numbers
+    with transaction() as cursor:
+        cursor.execute(
+            """
+            DELETE t FROM message_templates t
+            JOIN (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY template_id, id) AS ordinal
+                FROM message_templates
+                WHERE chat_id = %s
+            ) o ON o.id = t.id
+            WHERE o.ordinal = %s
+            """,
+            (chat_id, template_id)
+        )
+        removed = cursor.rowcount > 0
+    _chat_settings_cache.pop(chat_id)
+    return removed
 
 def list_message_templates(chat_id: int) -> list:
     """
     Get list of message templates for chat
     
+    Templates are numbered 1..N in the order they were added, so numbers
+    stay sequential after a removal without rewriting any rows.
+    
     Args:
         chat_id (int): ID of the chat
 
@@ -413,64 +1377,211 @@ def list_message_templates(chat_id: int) -> list:
         list: List of tuples (template_id, template_text) for templates in the chat
     """
     return execute_db_query(
-        "SELECT template_id, template_text FROM message_templates WHERE chat_id = %s",
+        """
+        SELECT ROW_NUMBER() OVER (ORDER BY template_id, id), template_text
+        FROM message_templates
+        WHERE chat_id = %s
+        ORDER BY template_id, id
+        """,
         chat_id,
         fetch=True
     )
 
-def reorder_template_ids(chat_id: int) -> None:
+def delete_chat_and_moderators(chat_id: int, chunk_size: int = TEARDOWN_CHUNK_SIZE) -> bool:
     """
-    Reorder template IDs sequentially for a given chat.
+    Delete chat and all connected data from database
+    
+    The chat is first marked as removed (chats.removed_at), then caches are
+    invalidated. Logged messages are deleted in chunks of `chunk_size` rows,
+    each in its own short transaction, so a chat with millions of rows never
+    holds locks for long. Finally one transaction deletes the templates and
+    the chats row; words, moderators, statistics rollups and any remaining
+    log rows go with it through ON DELETE CASCADE.
+    If the bot is added back meanwhile (restore_chat), the teardown stops
+    and the chat is kept. An interrupted teardown is picked up again by
+    resume_chat_teardown.
     
     Args:
-        chat_id (int): ID of the chat for which to reorder templates.
+        chat_id (int): ID of the chat to delete
+        chunk_size (int): Rows deleted per transaction
+    
+    Returns:
+        bool: True if the chat was deleted, False if it was re-added meanwhile
     """
-    templates = list_message_templates(chat_id)
-    for index, template in enumerate(templates, start=1):
-        update_template_id(chat_id, template[0], index)
+    with transaction() as cursor:
+        cursor.execute("UPDATE chats SET removed_at = NOW(6) WHERE id = %s", (chat_id,))
+        cursor.execute("SELECT removed_at FROM chats WHERE id = %s", (chat_id,))
+        row = cursor.fetchone()
+    _invalidate_chat(chat_id)
+    if row is None:
+        # Never stored; logs cannot exist without the chats row
+        return True
+    return _teardown_chat(chat_id, row[0], chunk_size)
 
-def update_template_id(chat_id: int, old_id: int, new_id: int) -> None:
+def resume_chat_teardown(chat_id: int, chunk_size: int = TEARDOWN_CHUNK_SIZE) -> bool:
     """
-    Update a specific template ID.
+    Continue an interrupted teardown of a chat marked as removed
     
     Args:
-        chat_id (int): ID of the chat.
-        old_id (int): Current ID of the template.
-        new_id (int): New ID to assign to the template.
+        chat_id (int): ID of the chat
+        chunk_size (int): Rows deleted per transaction
+    
+    Returns:
+        bool: True if the chat was deleted, False if it is no longer marked as removed
     """
-    execute_db_query("UPDATE message_templates SET template_id = %s WHERE chat_id = %s AND template_id = %s", (new_id, chat_id, old_id))
+    result = execute_db_query(
+        "SELECT removed_at FROM chats WHERE id = %s",
+        chat_id,
+        fetch=True
+    )
+    if not result or result[0][0] is None:
+        return False
+    _invalidate_chat(chat_id)
+    return _teardown_chat(chat_id, result[0][0], chunk_size)
 
-def delete_chat_and_moderators(chat_id: int) -> None:
+def pending_chat_teardowns() -> list[int]:
     """
-    Delete chat and all connected moderators from database
+    Get chats marked as removed whose data is not deleted yet
     
-    Args:
-        chat_id (int): ID of the chat to delete
+    Returns:
+        list[int]: IDs of the chats
     """
-    # Remove moderators for this chat
-    execute_db_query(
-        "DELETE FROM user_is_moderator WHERE chat_id = %s",
-        chat_id
-    )
-    # Remove chat itself
-    execute_db_query(
-        "DELETE FROM chats WHERE id = %s",
-        chat_id
-    )
-    # Optionally, remove other chat-related data (words, templates, logs)
-    execute_db_query(
-        "DELETE FROM words WHERE chat_id = %s",
-        chat_id
-    )
-    execute_db_query(
-        "DELETE FROM message_templates WHERE chat_id = %s",
-        chat_id
+    result = execute_db_query(
+        "SELECT id FROM chats WHERE removed_at IS NOT NULL",
+        fetch=True
     )
+    return [row[0] for row in result]
+
+def restore_chat(chat_id: int) -> None:
+    """
+    Clear the removal mark of a chat the bot was added back to, stopping its teardown
+    
+    Args:
+        chat_id (int): ID of the chat
+    """
     execute_db_query(
-        "DELETE FROM logs WHERE chat_id = %s",
+        "UPDATE chats SET removed_at = NULL WHERE id = %s",
         chat_id
     )
+
+def _invalidate_chat(chat_id: int) -> None:
+    """Drop everything cached about a chat."""
+    _known_chats.discard(chat_id)
+    _moderator_cache.pop_where(lambda key: key[0] == chat_id)
+    _banned_words_cache.pop(chat_id)
+    _chat_settings_cache.pop(chat_id)
+
+def _still_removed(cursor, chat_id: int, marker: datetime) -> bool:
+    """
+    Lock the chats row and check it still carries this teardown's removal mark
+    
+    The row lock makes restore_chat wait until the current chunk is committed.
+    """
+    cursor.execute("SELECT removed_at FROM chats WHERE id = %s FOR UPDATE", (chat_id,))
+    row = cursor.fetchone()
+    return row is not None and row[0] == marker
+
+def _teardown_chat(chat_id: int, marker: datetime, chunk_size: int) -> bool:
+    """
+    Delete the data of a chat marked as removed at `marker`
+    
+    Args:
+        chat_id (int): ID of the chat
+        marker (datetime): chats.removed_at set when the teardown started
+        chunk_size (int): Rows deleted per transaction
     
+    Returns:
+        bool: True if the chat was deleted, False if the mark was cleared or replaced
+    """
+    deleted = 0
+    # The large per-message and per-day tables; the rest goes with the chats row (ON DELETE CASCADE)
+    for table in ("logs", "stats_daily_words", "stats_daily_users"):
+        while True:
+            with transaction() as cursor:
+                if not _still_removed(cursor, chat_id, marker):
+                    log_system_event('chat_teardown_aborted', {'chat_id': chat_id, 'deleted_rows': deleted})
+                    return False
+                cursor.execute(f"DELETE FROM {table} WHERE chat_id = %s LIMIT %s", (chat_id, chunk_size))
+                rows = cursor.rowcount
+            deleted += rows
+            if rows < chunk_size:
+                break
+    
+    with transaction() as cursor:
+        if not _still_removed(cursor, chat_id, marker):
+            log_system_event('chat_teardown_aborted', {'chat_id': chat_id, 'deleted_rows': deleted})
+            return False
+        # message_templates has no ON DELETE CASCADE
+        cursor.execute("DELETE FROM message_templates WHERE chat_id = %s", (chat_id,))
+        cursor.execute("DELETE FROM chats WHERE id = %s", (chat_id,))
+    # Drop anything cached by lookups that ran during the teardown
+    _invalidate_chat(chat_id)
+    log_system_event('chat_teardown_finished', {'chat_id': chat_id, 'deleted_rows': deleted})
+    return True
+    
+def get_chat_settings(chat_id: int) -> ChatSettings:
+    """
+    Get locale, delete setting and templates of a chat, served from the in-memory cache
+    
+    Args:
+        chat_id (int): ID of the chat
+        
+    Returns:
+        ChatSettings: Settings of the chat, defaults if the chat is unknown
+    """
+    def load() -> ChatSettings:
+        rows = execute_db_query(
+            """
+            SELECT c.locale, c.delete_messages, c.normalization, c.fuzzy_distance, t.template_id, t.template_text
+            FROM chats c
+            LEFT JOIN message_templates t ON t.chat_id = c.id
+            WHERE c.id = %s
+            ORDER BY t.template_id, t.id
+            """,
+            chat_id,
+            fetch=True
+        )
+        if not rows:
+            return DEFAULT_CHAT_SETTINGS
+        # Templates are compiled once per load, so warnings are rendered without parsing
+        templates = []
+        for row in rows:
+            if row[4] is None:
+                continue
+            try:
+                templates.append((row[4], compile_template(row[5])))
+            except TemplateError as e:
+                # Stored before templates were validated; never used for warnings
+                log_system_event(
+                    'template_invalid',
+                    {'chat_id': chat_id, 'template_id': row[4], 'error': str(e)},
+                    'WARNING'
+                )
+        return ChatSettings(
+            locale=rows[0][0],
+            delete_messages=bool(rows[0][1]),
+            templates=tuple(templates),
+            normalization=rows[0][2],
+            fuzzy=rows[0][3]
+        )
+    return _chat_settings_cache.get_or_load(chat_id, load)
+
+def get_cache_stats() -> dict:
+    """
+    Get hit/miss counters of the in-memory caches
+    
+    Returns:
+        dict: Cache name -> counters (see LRUCache.stats)
+    """
+    return {
+        'banned_words': _banned_words_cache.stats(),
+        'blocklists': _blocklist_cache.stats(),
+        'chat_settings': _chat_settings_cache.stats(),
+        'moderators': _moderator_cache.stats(),
+        'superadmins': _superadmin_cache.stats(),
+        'verdicts': _verdict_cache.stats()
+    }
+
 def get_locale(chat_id: int) -> str:
     """
     Get the locale for a chat
@@ -481,12 +1592,7 @@ def get_locale(chat_id: int) -> str:
     Returns:
         str: Locale string for the chat, or 'en' if not set
     """
-    result = execute_db_query(
-        "SELECT locale FROM chats WHERE id = %s",
-        chat_id,
-        fetch=True
-    )
-    return result[0][0] if result else 'en'
+    return get_chat_settings(chat_id).locale
 
 def set_locale(chat_id: int, locale: str) -> bool:
     """
@@ -509,6 +1615,7 @@ def set_locale(chat_id: int, locale: str) -> bool:
         "UPDATE chats SET locale = %s WHERE id = %s",
         (locale, chat_id)
     )
+    _chat_settings_cache.pop(chat_id)
     
     return True
 
@@ -525,6 +1632,81 @@ def list_locales() -> list:
     )
     return [row[0] for row in result] if result else []
 
+def _statistics(chat_id: int, start: date = None, end: date = None) -> dict:
+    """
+    Compute statistics by merging the daily rollup buckets in a single query
+    
+    Top users, top words and the most banned message are computed by three
+    CTEs over the same day range and returned in one result set, tagged by kind,
+    so the whole report costs one round-trip on one connection.
+    Only the per-day rollups are read, so the cost depends on the number
+    of days, users and words in the range, not on the number of logged messages.
+    
+    Args:
+        chat_id (int): ID of the chat
+        start (date): First day included, None for no date filter
+        end (date): First day excluded, required with start
+        
+    Returns:
+        dict: See get_statistics()
+    """
+    if start is not None:
+        where = "chat_id = %s AND day >= %s AND day < %s"
+        params = (chat_id, start, end)
+    else:
+        where = "chat_id = %s"
+        params = (chat_id,)
+    
+    rows = execute_db_query(
+        f"""
+        WITH top_users AS (
+            SELECT 'user' AS kind, MAX(username) AS label, SUM(messages) AS cnt
+            FROM stats_daily_users
+            WHERE {where}
+            GROUP BY user_id
+            ORDER BY cnt DESC
+            LIMIT 10
+        ), top_words AS (
+            SELECT 'word' AS kind, word AS label, SUM(uses) AS cnt
+            FROM stats_daily_words
+            WHERE {where}
+            GROUP BY word
+            ORDER BY cnt DESC
+            LIMIT 10
+        ), top_message AS (
+            SELECT message_id, banned_count
+            FROM stats_daily_top_message
+            WHERE {where}
+            ORDER BY banned_count DESC
+            LIMIT 1
+        )
+        SELECT kind, label, cnt FROM top_users
+        UNION ALL
+        SELECT kind, label, cnt FROM top_words
+        UNION ALL
+        SELECT 'message', l.message_text, t.banned_count
+        FROM top_message t
+        JOIN logs l ON l.chat_id = %s AND l.message_id = t.message_id
+        ORDER BY kind, cnt DESC
+        """,
+        params * 3 + (chat_id,),
+        fetch=True
+    ) or []
+    
+    stats = {
+        "user_stats": [],
+        "word_stats": [],
+        "most_banned_message": None
+    }
+    for kind, label, count in rows:
+        if kind == 'user':
+            stats["user_stats"].append((label, int(count)))
+        elif kind == 'word':
+            stats["word_stats"].append((label, int(count)))
+        else:
+            stats["most_banned_message"] = (label, int(count))
+    return stats
+
 def get_statistics(chat_id: int, date) -> dict:
     """
     Returns statistics for a chat and date:
@@ -542,57 +1724,21 @@ def get_statistics(chat_id: int, date) -> dict:
             - word_stats (list): List of top banned words used
             - most_banned_message (tuple): Message with the most banned words used
     """
-    date_str = date.strftime("%Y-%m-%d")
-    # Top users
-    user_stats = execute_db_query(
-        """
-        SELECT l.username, COUNT(*) as cnt
-        FROM logs l
-        WHERE l.chat_id = %s AND DATE(l.timestamp) = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        GROUP BY l.user_id, l.username
-        ORDER BY cnt DESC
-        LIMIT 10
-        """,
-        (chat_id, date_str),
-        fetch=True
-    )
+    return get_statistics_range(chat_id, date, date)
 
-    # Top banned words
-    word_stats = execute_db_query(
-        """
-        SELECT bw.word, COUNT(*) as cnt
-        FROM logs l
-        JOIN JSON_TABLE(l.banned_words, '$[*]' COLUMNS(word VARCHAR(255) PATH '$')) bw
-        WHERE l.chat_id = %s AND DATE(l.timestamp) = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        GROUP BY bw.word
-        ORDER BY cnt DESC
-        LIMIT 10
-        """,
-        (chat_id, date_str),
-        fetch=True
-    )
+def get_statistics_range(chat_id: int, start: date, end: date) -> dict:
+    """
+    Get statistics for a chat over a range of days
     
-    # Message with most banned words
-    most_banned_message = execute_db_query(
-        """
-        SELECT l.message_text, JSON_LENGTH(l.banned_words) as banned_count
-        FROM logs l
-        WHERE l.chat_id = %s AND DATE(l.timestamp) = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        ORDER BY banned_count DESC
-        LIMIT 1
-        """,
-        (chat_id, date_str),
-        fetch=True
-    )
-     
-    return {
-        "user_stats": user_stats or [],
-        "word_stats": word_stats or [],
-        "most_banned_message": most_banned_message[0] if most_banned_message else None
-    }
+    Args:
+        chat_id (int): ID of the chat
+        start (date): First day of the range
+        end (date): Last day of the range, inclusive
+        
+    Returns:
+        dict: Dictionary containing statistics for the range, see get_statistics()
+    """
+    return _statistics(chat_id, start, end + timedelta(days=1))
     
 def get_statistics_full(chat_id: int) -> dict:
     """
@@ -602,55 +1748,6 @@ def get_statistics_full(chat_id: int) -> dict:
         chat_id (int): ID of the chat
         
     Returns:
-        dict: Dictionary containing statistics for the specified date range
+        dict: Dictionary containing statistics for all time, see get_statistics()
     """
-    # Top users
-    user_stats = execute_db_query(
-        """
-        SELECT l.username, COUNT(*) as cnt
-        FROM logs l
-        WHERE l.chat_id = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        GROUP BY l.user_id, l.username
-        ORDER BY cnt DESC
-        LIMIT 10
-        """,
-        (chat_id),
-        fetch=True
-    )
-
-    # Top banned words
-    word_stats = execute_db_query(
-        """
-        SELECT bw.word, COUNT(*) as cnt
-        FROM logs l
-        JOIN JSON_TABLE(l.banned_words, '$[*]' COLUMNS(word VARCHAR(255) PATH '$')) bw
-        WHERE l.chat_id = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        GROUP BY bw.word
-        ORDER BY cnt DESC
-        LIMIT 10
-        """,
-        (chat_id),
-        fetch=True
-    )
-    
-    # Message with most banned words
-    most_banned_message = execute_db_query(
-        """
-        SELECT l.message_text, JSON_LENGTH(l.banned_words) as banned_count
-        FROM logs l
-        WHERE l.chat_id = %s
-          AND l.banned_words IS NOT NULL AND JSON_LENGTH(l.banned_words) > 0
-        ORDER BY banned_count DESC
-        LIMIT 1
-        """,
-        (chat_id),
-        fetch=True
-    )
-     
-    return {
-        "user_stats": user_stats or [],
-        "word_stats": word_stats or [],
-        "most_banned_message": most_banned_message[0] if most_banned_message else None
-    }
\ No newline at end of file
+    return _statistics(chat_id)
\ No newline at end of file
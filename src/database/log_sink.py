@@ -0,0 +1,172 @@
+import asyncio
+import time
+from config.settings import (
+    LOG_SINK_BATCH_SIZE, LOG_SINK_FLUSH_INTERVAL, LOG_SINK_QUEUE_SIZE,
+    LOG_SINK_RETRY_ATTEMPTS, LOG_SINK_RETRY_DELAY
+)
+from database import async_db
+from database.pool import is_transient_error
+from utils.logger import log_system_event
+
+# Queued after the last row on shutdown
+_STOP = object()
+
+class LogSink:
+    """
+    Queue-backed writer coalescing `logs` rows into multi-row inserts
+
+    Handlers only enqueue messages; a background task flushes them once
+    `batch_size` rows are waiting or `flush_interval` seconds have passed
+    since the first queued row. When the queue is full, submit() waits
+    until the writer catches up.
+
+    Transient errors (see database.pool.is_transient_error) are retried
+    with exponential backoff. A batch that still fails is written row by
+    row, so one bad row (e.g. of a chat deleted meanwhile) only loses
+    itself; the writer must skip rows it already stored.
+
+    Args:
+        writer: Coroutine function storing a list of messages
+        batch_size (int): Maximum rows per insert
+        flush_interval (float): Maximum seconds a row waits in the queue
+        max_queue (int): Queued rows after which submit() blocks
+        retry_attempts (int): Retries of a write failing with a transient error
+        retry_delay (float): Seconds before the first retry, doubled for each further one
+    """
+    def __init__(self, writer, batch_size: int, flush_interval: float, max_queue: int,
+                 retry_attempts: int = 3, retry_delay: float = 0.5):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background writer; requires a running event loop."""
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, message: dict) -> None:
+        """
+        Queue a message for insertion, waiting while the queue is full
+
+        Args:
+            message (dict): Message data, see database.db.add_messages()
+        """
+        if not self.running or self._stopping:
+            # No writer (e.g. a one-off script) or shutting down: write directly
+            await self.writer([message])
+            return
+        await self._queue.put(message)
+
+    async def _next_batch(self) -> tuple[list[dict], bool]:
+        """
+        Wait for the first row, then collect rows until the batch is full or the interval passes
+
+        Returns:
+            tuple: (rows to write, whether the stop marker was reached)
+        """
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _write_with_retry(self, batch: list[dict]) -> None:
+        """Write a batch, retrying transient errors with exponential backoff."""
+        for attempt in range(self.retry_attempts + 1):
+            try:
+                await self.writer(batch)
+                return
+            except Exception as e:
+                if attempt == self.retry_attempts or not is_transient_error(e):
+                    raise
+                log_system_event(
+                    'log_sink_retry',
+                    {'error': str(e), 'rows': len(batch), 'attempt': attempt + 1},
+                    'WARNING'
+                )
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            await self._write_with_retry(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                log_system_event(
+                    'log_sink_error',
+                    {'error': str(e), 'message_id': batch[0].get('message_id'), 'chat_id': batch[0].get('chat_id')},
+                    'ERROR'
+                )
+                return
+            log_system_event(
+                'log_sink_batch_failed',
+                {'error': str(e), 'rows': len(batch)},
+                'WARNING'
+            )
+        # Isolate the failing rows instead of losing the whole batch
+        for message in batch:
+            await self._write([message])
+
+    async def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def drain(self) -> None:
+        """
+        Flush every queued row and stop the background writer
+        """
+        if not self.running:
+            return
+        self._stopping = True
+        # Queued rows are written in order before the worker reaches the stop marker
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        log_system_event('log_sink_drained', {})
+
+_sink = None
+
+def get_log_sink() -> LogSink:
+    """
+    Initialize and return the global log sink.
+    If the sink is already initialized, it returns the existing instance.
+
+    Returns:
+        LogSink: The log sink instance.
+    """
+    global _sink
+    if _sink is None:
+        _sink = LogSink(
+            async_db.add_messages,
+            batch_size=LOG_SINK_BATCH_SIZE,
+            flush_interval=LOG_SINK_FLUSH_INTERVAL,
+            max_queue=LOG_SINK_QUEUE_SIZE,
+            retry_attempts=LOG_SINK_RETRY_ATTEMPTS,
+            retry_delay=LOG_SINK_RETRY_DELAY
+        )
+    return _sink
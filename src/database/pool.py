@@ -0,0 +1,228 @@
+import time
+import queue
+import threading
+import mysql.connector
+from contextlib import contextmanager
+from mysql.connector import errors as mysql_errors
+from utils.logger import log_system_event
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out of the pool in time."""
+
+class _PooledConnection:
+    """
+    Connection wrapper that remembers when it was opened and last used
+
+    Args:
+        conn: Underlying mysql.connector connection
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def expired(self, max_lifetime: int) -> bool:
+        return max_lifetime > 0 and time.monotonic() - self.created_at > max_lifetime
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQL connections
+
+    Connections are reused between queries instead of being opened for every call.
+    On checkout a connection is replaced if it outlived `max_lifetime` and pinged
+    (with reconnect) if it sat idle longer than `ping_interval`.
+
+    Args:
+        size (int): Maximum number of open connections
+        max_lifetime (int): Seconds after which a connection is recycled (0 disables)
+        timeout (float): Seconds to wait for a free connection before giving up
+        ping_interval (int): Idle seconds after which a connection is pinged on checkout (0 pings always)
+        reconnect_attempts (int): Attempts made when opening a connection fails
+        reconnect_delay (float): Delay in seconds between reconnect attempts
+        **connect_kwargs: Arguments passed to mysql.connector.connect
+    """
+    def __init__(self, size: int, max_lifetime: int, timeout: float, ping_interval: int,
+                 reconnect_attempts: int, reconnect_delay: float, **connect_kwargs):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.reconnect_attempts = max(1, reconnect_attempts)
+        self.reconnect_delay = reconnect_delay
+        self._connect_kwargs = connect_kwargs
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _connect(self) -> _PooledConnection:
+        """
+        Open a new connection, retrying on failure
+
+        Returns:
+            _PooledConnection: Freshly opened connection
+
+        Raises:
+            Exception: If every attempt failed
+        """
+        for attempt in range(1, self.reconnect_attempts + 1):
+            try:
+                return _PooledConnection(mysql.connector.connect(**self._connect_kwargs))
+            except mysql_errors.Error as e:
+                log_system_event(
+                    'db_connect_error',
+                    {'error': str(e), 'attempt': attempt, 'attempts': self.reconnect_attempts},
+                    'WARNING' if attempt < self.reconnect_attempts else 'ERROR'
+                )
+                if attempt == self.reconnect_attempts:
+                    raise
+                time.sleep(self.reconnect_delay * attempt)
+
+    def _check(self, pooled: _PooledConnection) -> _PooledConnection:
+        """
+        Health check performed on checkout
+
+        Args:
+            pooled (_PooledConnection): Idle connection taken from the pool
+
+        Returns:
+            _PooledConnection: The same connection if healthy, otherwise a new one
+        """
+        if pooled.expired(self.max_lifetime):
+            pooled.close()
+            return self._connect()
+        if time.monotonic() - pooled.last_used >= self.ping_interval:
+            try:
+                pooled.conn.ping(reconnect=True, attempts=self.reconnect_attempts, delay=self.reconnect_delay)
+            except mysql_errors.Error as e:
+                log_system_event('db_ping_error', {'error': str(e)}, 'WARNING')
+                pooled.close()
+                return self._connect()
+        return pooled
+
+    def acquire(self) -> _PooledConnection:
+        """
+        Check a connection out of the pool
+
+        Returns:
+            _PooledConnection: Healthy connection
+
+        Raises:
+            PoolTimeoutError: If all connections stay busy for longer than `timeout`
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No free database connection after {self.timeout}s")
+        try:
+            try:
+                pooled = self._check(self._idle.get_nowait())
+            except queue.Empty:
+                pooled = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        return pooled
+
+    def release(self, pooled: _PooledConnection, discard: bool = False) -> None:
+        """
+        Return a connection to the pool
+
+        Args:
+            pooled (_PooledConnection): Connection previously returned by acquire()
+            discard (bool): Close the connection instead of reusing it
+        """
+        try:
+            if not discard and not self._closed:
+                try:
+                    # End any open read transaction so the next user gets a fresh snapshot
+                    if pooled.conn.in_transaction:
+                        pooled.conn.rollback()
+                except mysql_errors.Error:
+                    discard = True
+            if discard or self._closed:
+                pooled.close()
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager yielding a pooled connection
+
+        The connection is discarded instead of reused if the block raised
+        and the connection was lost.
+        """
+        pooled = self.acquire()
+        discard = False
+        try:
+            yield pooled.conn
+        except Exception:
+            discard = not _is_alive(pooled.conn)
+            raise
+        finally:
+            self.release(pooled, discard=discard)
+
+    def close(self) -> None:
+        """Close all idle connections and refuse new checkouts."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+def _is_alive(conn) -> bool:
+    """
+    Check whether a connection is still usable without reconnecting
+
+    Args:
+        conn: mysql.connector connection
+
+    Returns:
+        bool: True if the connection answers a ping
+    """
+    try:
+        conn.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+def is_connection_error(error: Exception) -> bool:
+    """
+    Check whether an exception means the connection itself failed
+
+    Args:
+        error (Exception): Exception raised by a query
+
+    Returns:
+        bool: True for lost/unavailable connection errors
+    """
+    return isinstance(error, (mysql_errors.OperationalError, mysql_errors.InterfaceError))
+
+# Server errors worth retrying: deadlock found, lock wait timeout exceeded
+_TRANSIENT_ERRNOS = (1213, 1205)
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether a failed statement may succeed when simply retried
+
+    Args:
+        error (Exception): Exception raised by a query or a pool checkout
+
+    Returns:
+        bool: True for connection errors, pool timeouts, deadlocks and lock wait timeouts
+    """
+    if is_connection_error(error) or isinstance(error, PoolTimeoutError):
+        return True
+    return isinstance(error, mysql_errors.Error) and error.errno in _TRANSIENT_ERRNOS
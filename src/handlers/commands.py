@@ -1,9 +1,13 @@
 from telegram import Update, BotCommand, BotCommandScopeChat
 from telegram.ext import CallbackContext, ContextTypes
-from database import db
+from database import async_db as db
 from utils.logger import log_message, log_system_event
-from config.settings import DEFAULT_TEMPLATE
+from utils.templates import TemplateError, compile_template, get_default_template
+from config.settings import WORD_IMPORT_MAX_BYTES, FUZZY_MAX_DISTANCE, FUZZY_MIN_LENGTH, FUZZY_MIN_LENGTH_2
+from matching.normalize import PROFILES
+from matching.engines import has_inner_wildcard, shared_matcher_count
 import re
+import random
 from datetime import datetime
 from utils import args as global_args
 from languages.language_core import get_locales, reinitialize_locales, list_locales, get_locales_list
@@ -11,6 +15,21 @@ from functools import wraps
 
 locales = get_locales()
 
+def parse_words(args: list[str]) -> list[str]:
+    """
+    Split command arguments into banned words, keeping "quoted phrases" together
+    
+    Args:
+        args (list[str]): Command arguments
+    
+    Returns:
+        list[str]: Words and phrases
+    """
+    return [phrase or word for phrase, word in re.findall(r'"([^"]+)"|(\S+)', " ".join(args))]
+
+# Names of shared blocklists, e.g. "profanity-en"
+BLOCKLIST_NAME = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+
 def command_middleware(func):
     log_system_event(
         'command_middleware',
@@ -29,13 +48,14 @@ def command_middleware(func):
         else:
             chat_title = chat.title or f"Chat {chat.id}"
 
-        chat_created = not db.ensure_chat_exists(chat.id, chat_title)
+        # Known chats skip the database entirely
+        chat_created = not db.is_known_chat(chat.id) and not await db.ensure_chat_exists(chat.id, chat_title)
         result = await func(update, context, *args, **kwargs)
 
         if chat_created:
             await on_bot_added(update, context)
-            if not db.check_if_moderator(chat.id, user.id) is 0:
-                db.new_moderator(user.id, user.username, chat.id)
+            if not await db.check_if_moderator(chat.id, user.id) is 0:
+                await db.new_moderator(user.id, user.username, chat.id)
 
         return result
     return wrapper
@@ -64,31 +84,18 @@ async def check_message(update: Update, context: CallbackContext) -> None:
 
         # Check message for banned words
         chat_id = update.effective_chat.id
-        banned_words = db.get_banned_words(chat_id)
-        bad_words = []
-        
-        message = re.sub(r"[^\w\s']", ' ', update.message.text)
         
-        # Split message text into words for whole-word matching
-        message_words = set(message.lower().split())
-        
-        # Check each banned word against the message
-        for word in banned_words:
-            if word.lower() in message_words:
-                bad_words.append(word)
+        # Single pass over the message with the chat's compiled matcher, skipped for repeated texts
+        bad_words = await db.find_banned_words(chat_id, update.message.text)
                 
         if bad_words:
-            template = db.get_message_template(chat_id) or DEFAULT_TEMPLATE
-            
-            # Preparation of parameters for formatting
-            format_params = {}
-            if '{name}' in template:
-                format_params['name'] = update.message.from_user.first_name
-            if '{word}' in template:
-                format_params['word'] = ', '.join(bad_words)
-            
-            # Formatting the template with available parameters
-            warning = template.format(**format_params)
+            settings = await db.get_chat_settings(chat_id)
+            # Templates are compiled when the chat settings are loaded
+            template = random.choice(settings.templates)[1] if settings.templates else get_default_template()
+            warning = template.render(
+                name=update.message.from_user.first_name,
+                word=', '.join(bad_words)
+            )
             await update.message.reply_text(warning)
             message_data['is_banned'] = True
             message_data['banned_words'] = bad_words
@@ -99,7 +106,7 @@ async def check_message(update: Update, context: CallbackContext) -> None:
                 message_data
             )
             
-            if db.delete_messages_check(chat_id):
+            if settings.delete_messages:
                 await update.message.delete()
 
     except Exception as e:
@@ -124,14 +131,14 @@ async def word_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     if not context.args:
         await update.message.reply_text(locales[current_locale]['word']['no_args'])
         return
 
     action = context.args[0].lower()
-    if action not in ['ban', 'unban', 'list', 'clear']:
+    if action not in ['ban', 'unban', 'list', 'clear', 'import', 'normalize', 'fuzzy', 'subscribe', 'unsubscribe']:
         await update.message.reply_text(locales[current_locale]['word']['invalid_action'])
         return
     
@@ -139,16 +146,21 @@ async def word_command(update: Update, context: CallbackContext) -> None:
     user_id = update.effective_user.id
 
     if action == 'list':
-        words = db.get_banned_words(chat_id)
+        words = await db.get_banned_words(chat_id)
+        blocklists = await db.get_chat_blocklists(chat_id)
+        subscribed = (
+            "\n\n" + locales[current_locale]['word']['list_blocklists'].format(names=', '.join(blocklists))
+            if blocklists else ""
+        )
         
         if not words:
-            await update.message.reply_text(locales[current_locale]['word']['list_empty'])
+            await update.message.reply_text(locales[current_locale]['word']['list_empty'] + subscribed)
             return
         
-        await update.message.reply_text(f"{locales[current_locale]['word']['list_header']}" + "\n".join(f"- {word}" for word in words))
+        await update.message.reply_text(f"{locales[current_locale]['word']['list_header']}" + "\n".join(f"- {word}" for word in words) + subscribed)
         return
 
-    if db.check_if_moderator(chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         
         log_system_event(
@@ -165,15 +177,183 @@ async def word_command(update: Update, context: CallbackContext) -> None:
         return
 
     if action == 'clear':
-        db.clear_words_by_chat(chat_id)
+        await db.clear_words_by_chat(chat_id)
         await update.message.reply_text(locales[current_locale]['word']['cleared'])
         return
 
+    if action == 'normalize':
+        profiles = ', '.join(PROFILES)
+        if len(context.args) < 2:
+            settings = await db.get_chat_settings(chat_id)
+            await update.message.reply_text(
+                locales[current_locale]['word']['normalize_current'].format(profile=settings.normalization, profiles=profiles)
+            )
+            return
+        profile = context.args[1].lower()
+        if not await db.set_normalization(chat_id, profile):
+            await update.message.reply_text(locales[current_locale]['word']['normalize_invalid'].format(profiles=profiles))
+            return
+        log_system_event(
+            'command_executed',
+            {
+                'command': 'normalize',
+                'profile': profile,
+                'user_id': user_id,
+                'chat_id': chat_id
+            }
+        )
+        await update.message.reply_text(locales[current_locale]['word']['normalize_success'].format(profile=profile))
+        return
+
+    if action == 'fuzzy':
+        if len(context.args) < 2:
+            settings = await db.get_chat_settings(chat_id)
+            await update.message.reply_text(
+                locales[current_locale]['word']['fuzzy_current'].format(
+                    distance=settings.fuzzy, length=FUZZY_MIN_LENGTH, length2=FUZZY_MIN_LENGTH_2,
+                    max=FUZZY_MAX_DISTANCE
+                )
+            )
+            return
+        try:
+            distance = int(context.args[1])
+        except ValueError:
+            distance = -1
+        if not await db.set_fuzzy(chat_id, distance):
+            await update.message.reply_text(locales[current_locale]['word']['fuzzy_invalid'].format(max=FUZZY_MAX_DISTANCE))
+            return
+        log_system_event(
+            'command_executed',
+            {
+                'command': 'fuzzy',
+                'distance': distance,
+                'user_id': user_id,
+                'chat_id': chat_id
+            }
+        )
+        await update.message.reply_text(locales[current_locale]['word']['fuzzy_success'].format(distance=distance))
+        return
+
+    if action in ('subscribe', 'unsubscribe'):
+        if len(context.args) < 2:
+            if action == 'unsubscribe':
+                await update.message.reply_text(locales[current_locale]['word']['unsubscribe_no_name'])
+                return
+            blocklists = await db.list_blocklists()
+            if not blocklists:
+                await update.message.reply_text(locales[current_locale]['word']['blocklists_empty'])
+                return
+            subscribed = set(await db.get_chat_blocklists(chat_id))
+            await update.message.reply_text(
+                locales[current_locale]['word']['blocklists_header'] + "\n".join(
+                    f"{'*' if name in subscribed else '-'} {name} ({size})" for name, size in blocklists
+                )
+            )
+            return
+        name = context.args[1].lower()
+        if action == 'subscribe':
+            result = await db.subscribe_blocklist(chat_id, name, update.effective_chat.title or str(chat_id))
+        else:
+            result = await db.unsubscribe_blocklist(chat_id, name)
+        if result is None:
+            await update.message.reply_text(locales[current_locale]['word']['blocklist_unknown'].format(name=name))
+            return
+        log_system_event(
+            'command_executed',
+            {
+                'command': action,
+                'blocklist': name,
+                'changed': result,
+                'user_id': user_id,
+                'chat_id': chat_id
+            }
+        )
+        if action == 'subscribe':
+            key = 'subscribe_success' if result else 'subscribe_already'
+        else:
+            key = 'unsubscribe_success' if result else 'unsubscribe_not_subscribed'
+        await update.message.reply_text(locales[current_locale]['word'][key].format(name=name))
+        return
+
+    if action == 'import':
+        # The word list comes from the document the command replies to
+        # (commands sent as a file caption never reach this handler)
+        reply = update.message.reply_to_message
+        document = reply.document if reply else None
+        if not document:
+            await update.message.reply_text(locales[current_locale]['word']['import_no_file'])
+            return
+        too_large = locales[current_locale]['word']['import_too_large'].format(size=WORD_IMPORT_MAX_BYTES // 1024)
+        # Files of unknown size are not downloaded at all
+        if document.file_size is None or document.file_size > WORD_IMPORT_MAX_BYTES:
+            await update.message.reply_text(too_large)
+            return
+        try:
+            file = await document.get_file()
+            data = await file.download_as_bytearray()
+            if len(data) > WORD_IMPORT_MAX_BYTES:
+                await update.message.reply_text(too_large)
+                return
+            content = bytes(data).decode('utf-8-sig')
+        except UnicodeDecodeError:
+            await update.message.reply_text(locales[current_locale]['word']['import_bad_file'])
+            return
+        # One word or phrase per line, lines starting with # are comments
+        words = [line.strip() for line in content.splitlines()]
+        words = [word for word in words if word and not word.startswith('#')]
+        # Longer words do not fit the column and would fail the whole insert
+        too_long = sum(1 for word in words if len(word) > db.WORD_MAX_LENGTH)
+        words = [word for word in words if len(word) <= db.WORD_MAX_LENGTH]
+        inner_wildcards = sum(1 for word in words if has_inner_wildcard(word))
+        words = [word for word in words if not has_inner_wildcard(word)]
+        if not words:
+            await update.message.reply_text(locales[current_locale]['word']['import_bad_file'])
+            return
+        try:
+            added = len(await db.add_banned_words(words, chat_id, user_id, update.effective_chat.title or str(chat_id)))
+        except Exception as e:
+            log_system_event(
+                'command_error',
+                {
+                    'command': 'import',
+                    'error': str(e),
+                    'user_id': user_id,
+                    'chat_id': chat_id
+                },
+                'ERROR'
+            )
+            await update.message.reply_text(locales[current_locale]['error'])
+            return
+        log_system_event(
+            'command_executed',
+            {
+                'command': 'import',
+                'user_id': user_id,
+                'chat_id': chat_id,
+                'words': len(words),
+                'added': added,
+                'too_long': too_long,
+                'inner_wildcards': inner_wildcards
+            }
+        )
+        reply_text = locales[current_locale]['word']['import_success'].format(
+            added=added,
+            skipped=len({word.lower() for word in words}) - added
+        )
+        if too_long:
+            reply_text += "\n" + locales[current_locale]['word']['words_too_long'].format(
+                count=too_long, max=db.WORD_MAX_LENGTH
+            )
+        if inner_wildcards:
+            reply_text += "\n" + locales[current_locale]['word']['import_inner_wildcard'].format(count=inner_wildcards)
+        await update.message.reply_text(reply_text)
+        return
+
     if len(context.args) < 2:
-        await update.message.reply_text(locales[db.get_locale(chat_id)]['word']['too_short'].format(action=action))
+        await update.message.reply_text(locales[await db.get_locale(chat_id)]['word']['too_short'].format(action=action))
         return
 
-    words = context.args[1:]
+    words = parse_words(context.args[1:])
     chat_name = update.effective_chat.title or str(chat_id)
     
     if len(words) == 0:
@@ -189,8 +369,28 @@ async def word_command(update: Update, context: CallbackContext) -> None:
         )
         return
     
+    # Appended to the replies of /word ban
+    too_long_text = ""
+    if action == 'ban':
+        # `*` only works at the start or end of a word (see matching.engines.parse_pattern)
+        invalid = [w for w in words if has_inner_wildcard(w)]
+        if invalid:
+            await update.message.reply_text(
+                locales[current_locale]['word']['ban_inner_wildcard'].format(words=', '.join(invalid))
+            )
+            return
+        # Skipped and reported the same way as by /word import
+        too_long = sum(1 for w in words if len(w) > db.WORD_MAX_LENGTH)
+        if too_long:
+            words = [w for w in words if len(w) <= db.WORD_MAX_LENGTH]
+            too_long_text = "\n" + locales[current_locale]['word']['words_too_long'].format(
+                count=too_long, max=db.WORD_MAX_LENGTH
+            )
+            if not words:
+                await update.message.reply_text(too_long_text.strip())
+                return
     
-    word_list = db.get_banned_words(chat_id)
+    word_list = await db.filter_banned_words(chat_id, words)
     banned = [w for w in words if w.lower() in word_list]
     not_banned = [w for w in words if w.lower() not in word_list]
 
@@ -211,16 +411,24 @@ async def word_command(update: Update, context: CallbackContext) -> None:
             if banned == words:
                 # If all words are already banned, reply with a message
                 await update.message.reply_text(
-                    locales[current_locale]['word']['ban_banned'].format(words=', '.join(words))
+                    locales[current_locale]['word']['ban_banned'].format(words=', '.join(words)) + too_long_text
+                )
+                return
+            added = set(await db.add_banned_words(not_banned, chat_id, user_id, chat_name))
+            # Words equal to a banned one under the database collation (e.g. café and cafe) are not added
+            banned += [w for w in not_banned if w.lower() not in added]
+            not_banned = [w for w in not_banned if w.lower() in added]
+            if not not_banned:
+                await update.message.reply_text(
+                    locales[current_locale]['word']['ban_banned'].format(words=', '.join(banned)) + too_long_text
                 )
                 return
-            for word in not_banned:
-                db.add_banned_word(word, chat_id, user_id, chat_name)
                 
             # Reply with confirmation message
             await update.message.reply_text(
-                locales[current_locale]['word']['banned_success'].format(words=', '.join([w for w in words if w.lower() not in banned]))
-                + (banned and " " + locales[current_locale]['word']['banned_success'].format(words=', '.join(banned)) if banned else "")
+                locales[current_locale]['word']['banned_success'].format(words=', '.join(not_banned))
+                + (" " + locales[current_locale]['word']['already_banned'].format(words=', '.join(banned)) if banned else "")
+                + too_long_text
             )
             
         except Exception as e:
@@ -255,8 +463,7 @@ async def word_command(update: Update, context: CallbackContext) -> None:
                     locales[current_locale]['word']['unban_not_banned'].format(words=', '.join(words))
                 )
                 return
-            for word in banned:
-                db.remove_banned_word(word, update.message.chat_id)
+            await db.remove_banned_words(banned, chat_id)
             # Reply with confirmation message
             await update.message.reply_text(
                 locales[current_locale]['word']['unbanned_success'].format(words=', '.join([w for w in words if w.lower() not in not_banned]))
@@ -285,7 +492,7 @@ async def mod_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     if not context.args:
         await update.message.reply_text(locales[current_locale]['mod']['no_args'])
@@ -296,7 +503,7 @@ async def mod_command(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text(locales[current_locale]['mod']['invalid_action'])
         return
         
-    if db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         log_system_event(
             'access_denied',
@@ -311,7 +518,7 @@ async def mod_command(update: Update, context: CallbackContext) -> None:
         return
         
     if action == 'list':
-        moderators = db.list_moderators(update.message.chat_id)
+        moderators = await db.list_moderators(update.message.chat_id)
         if not moderators:
             await update.message.reply_text(locales[current_locale]['mod']['list_empty'])
             return
@@ -326,7 +533,7 @@ async def mod_command(update: Update, context: CallbackContext) -> None:
         username = replied_user.username
         
         if action == 'add':
-            status = db.new_moderator(user_id, username, update.message.chat_id)
+            status = await db.new_moderator(user_id, username, update.message.chat_id)
             if status == "super_admin":
                 await update.message.reply_text(locales[current_locale]['mod']['add_superadmin'])
             elif status == "already_moderator":
@@ -334,7 +541,7 @@ async def mod_command(update: Update, context: CallbackContext) -> None:
             else:
                 await update.message.reply_text(locales[current_locale]['mod']['add_success'].format(user=username or user_id))
         else:  # delete
-            status = db.delete_moderator(user_id, update.message.chat_id)
+            status = await db.delete_moderator(user_id, update.message.chat_id)
             if status == "super_admin":
                 await update.message.reply_text(locales[current_locale]['mod']['delete_superadmin'])
             else:
@@ -354,7 +561,7 @@ async def template_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     if not context.args:
         await update.message.reply_text(locales[current_locale]['template']['no_args'])
@@ -365,7 +572,7 @@ async def template_command(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text(locales[current_locale]['template']['invalid_action'])
         return
 
-    if db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         return
 
@@ -380,7 +587,7 @@ async def template_command(update: Update, context: CallbackContext) -> None:
                     'chat_id': update.effective_chat.id
                 }
             )
-            templates = db.list_message_templates(update.message.chat_id)
+            templates = await db.list_message_templates(update.message.chat_id)
             if not templates:
                 await update.message.reply_text(locales[current_locale]['template']['list_empty'])
                 return
@@ -419,10 +626,13 @@ async def template_command(update: Update, context: CallbackContext) -> None:
                 return
             # Ensure template is a single string
             template = " ".join(context.args[1:]).strip()
-            db.add_message_template(update.message.chat_id, template)
-            
-            # Update template IDs to be sequential
-            db.reorder_template_ids(update.message.chat_id)
+            # Reject bad placeholders now instead of failing when a warning is sent
+            try:
+                compile_template(template)
+            except TemplateError as e:
+                await update.message.reply_text(locales[current_locale]['template']['add_invalid'].format(error=str(e)))
+                return
+            await db.add_message_template(update.message.chat_id, template)
             
             await update.message.reply_text(locales[current_locale]['template']['add_success'])
             return
@@ -454,10 +664,8 @@ async def template_command(update: Update, context: CallbackContext) -> None:
             )
             # Ensure template ID is an integer
             template_id = int(context.args[1])
-            db.remove_message_template(update.message.chat_id, template_id)
-            
-            # Update template IDs to be sequential
-            db.reorder_template_ids(update.message.chat_id)
+            if not await db.remove_message_template(update.message.chat_id, template_id):
+                raise ValueError("No template with this ID")
             
             await update.message.reply_text(locales[current_locale]['template']['remove_success'])
         except ValueError:
@@ -494,14 +702,14 @@ async def messages_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
-    if db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         return
         
     timestamp = context.args[0] if context.args else None
-    messages = db.show_messages_by_chat(update.message.chat_id, timestamp)
+    messages = await db.show_messages_by_chat(update.message.chat_id, timestamp)
     
     if not messages:
         await update.message.reply_text(locales[current_locale]['messages']['recent_empty'])
@@ -522,15 +730,15 @@ async def delete_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
-    if db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         return
         
     # Show current status
     if not context.args:
-        current = db.delete_messages_check(update.message.chat_id)
+        current = await db.delete_messages_check(update.message.chat_id)
         await update.message.reply_text(locales[current_locale]['delete']['show'].format(status='enabled' if current else 'disabled'))
         return
         
@@ -541,7 +749,7 @@ async def delete_command(update: Update, context: CallbackContext) -> None:
         return
         
     # Update deletion setting in database
-    db.delete_messages_change(update.message.chat_id, value == 'on')
+    await db.delete_messages_change(update.message.chat_id, value == 'on')
     await update.message.reply_text(locales[current_locale]['delete']['switch'].format(value=value))
 
 @command_middleware
@@ -554,7 +762,7 @@ async def locale_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     if not context.args:
         await update.message.reply_text(locales[current_locale]['locale']['no_args'])
@@ -565,7 +773,7 @@ async def locale_command(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text(locales[current_locale]['locale']['invalid_action'])
         return
     
-    if db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
+    if await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is False:
         await update.message.reply_text(locales[current_locale]['no_access'])
         log_system_event(
             'access_denied',
@@ -588,7 +796,7 @@ async def locale_command(update: Update, context: CallbackContext) -> None:
         return
 
     if action == 'current':
-        locale = db.get_locale(update.message.chat_id)
+        locale = await db.get_locale(update.message.chat_id)
         if not locale:
             await update.message.reply_text(locales[current_locale]['locale']['current_empty'])
             return
@@ -600,7 +808,7 @@ async def locale_command(update: Update, context: CallbackContext) -> None:
             await update.message.reply_text(locales[current_locale]['locale']['set_no_locale'])
             return
         locale = " ".join(context.args[1:]).lower()
-        if db.set_locale(update.message.chat_id, locale):
+        if await db.set_locale(update.message.chat_id, locale):
             await update.message.reply_text(locales[current_locale]['locale']['set'].format(locale=locale))
         else:
             await update.message.reply_text(locales[current_locale]['locale']['set_invalid_locale'].format(locale=locale))
@@ -625,9 +833,9 @@ async def reinitialize_locales_command(update: Update, context: CallbackContext)
     """
 
     global locales
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
 
-    if not db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
+    if not await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
         await update.message.reply_text(locales[current_locale]['no_access'])
 
         log_system_event(
@@ -663,9 +871,9 @@ async def all_locales_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
-    if not db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
+    if not await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
         await update.message.reply_text(locales[current_locale]['no_access'])
         return
     
@@ -676,39 +884,170 @@ async def all_locales_command(update: Update, context: CallbackContext) -> None:
     
     await update.message.reply_text("Available locales:\n" + "\n".join(locales))
 
+@command_middleware
+async def cache_stats_command(update: Update, context: CallbackContext) -> None:
+    """
+    Show hit/miss counters of the in-memory caches
+    
+    Args:
+        update (Update): Incoming update from Telegram
+        context (CallbackContext): Context for the callback
+    """
+    
+    current_locale = await db.get_locale(update.effective_chat.id)
+    
+    if not await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
+        await update.message.reply_text(locales[current_locale]['no_access'])
+        return
+    
+    stats = await db.get_cache_stats()
+    await update.message.reply_text("Cache statistics:\n" + "\n".join(
+        f"{name}: {s['hits']} hits, {s['misses']} misses ({s['hit_ratio']:.1%}), {s['size']}/{s['maxsize']} entries"
+        for name, s in stats.items()
+    ) + f"\nDistinct compiled word lists: {shared_matcher_count()} for {stats['banned_words']['size']} cached chats")
+
+@command_middleware
+async def blocklist_command(update: Update, context: CallbackContext) -> None:
+    """
+    Manage shared blocklists (superadmins only): list, create, delete, add, remove
+    
+    Args:
+        update (Update): Incoming update from Telegram
+        context (CallbackContext): Context for the callback
+    """
+    
+    current_locale = await db.get_locale(update.effective_chat.id)
+    
+    if not await db.check_if_moderator(update.message.chat_id, update.message.from_user.id) is 0:
+        await update.message.reply_text(locales[current_locale]['no_access'])
+        
+        log_system_event(
+            'access_denied',
+            {
+                'command': 'blocklist',
+                'user_id': update.effective_user.id,
+                'username': update.effective_user.username,
+            },
+            "WARNING"
+        )
+        
+        return
+    
+    usage = (
+        "Usage:\n/blocklist list\n/blocklist create <name>\n/blocklist delete <name>\n"
+        "/blocklist add <name> <words>\n/blocklist remove <name> <words>"
+    )
+    action = context.args[0].lower() if context.args else None
+    
+    if action == 'list':
+        blocklists = await db.list_blocklists()
+        if not blocklists:
+            await update.message.reply_text("No blocklists yet")
+            return
+        await update.message.reply_text("Blocklists:\n" + "\n".join(f"- {name} ({size} words)" for name, size in blocklists))
+        return
+    
+    if action not in ('create', 'delete', 'add', 'remove') or len(context.args) < 2:
+        await update.message.reply_text(usage)
+        return
+    
+    name = context.args[1].lower()
+    try:
+        if action == 'create':
+            if not BLOCKLIST_NAME.fullmatch(name):
+                await update.message.reply_text("Names use up to 64 lowercase letters, digits, '-' and '_'")
+                return
+            if await db.create_blocklist(name, update.effective_user.id):
+                reply = f"Blocklist '{name}' created"
+            else:
+                reply = f"Blocklist '{name}' already exists"
+        elif action == 'delete':
+            if await db.delete_blocklist(name):
+                reply = f"Blocklist '{name}' deleted"
+            else:
+                reply = f"There is no blocklist named '{name}'"
+        else:
+            words = parse_words(context.args[2:])
+            if not words:
+                await update.message.reply_text(usage)
+                return
+            if action == 'add' and any(has_inner_wildcard(word) for word in words):
+                await update.message.reply_text("'*' only works at the start or end of a word")
+                return
+            if action == 'add':
+                changed = await db.add_blocklist_words(name, words)
+            else:
+                changed = await db.remove_blocklist_words(name, words)
+            if changed is None:
+                reply = f"There is no blocklist named '{name}'"
+            else:
+                reply = f"{'Added' if action == 'add' else 'Removed'} {changed} of {len(words)} words"
+    except Exception as e:
+        log_system_event(
+            'command_error',
+            {
+                'command': 'blocklist',
+                'action': action,
+                'error': str(e),
+                'user_id': update.effective_user.id
+            },
+            'ERROR'
+        )
+        await update.message.reply_text(locales[current_locale]['error'])
+        return
+    
+    log_system_event(
+        'command_executed',
+        {
+            'command': 'blocklist',
+            'action': action,
+            'blocklist': name,
+            'user_id': update.effective_user.id
+        }
+    )
+    await update.message.reply_text(reply)
+
 @command_middleware
 async def statistics_command(update: Update, context: CallbackContext) -> None:
     """
-    Show statistics for today or a given date
+    Show statistics for today, a given date, a date range (dd-mm-yy..dd-mm-yy) or all time (full)
     
     Args:
         update (Update): Incoming update from Telegram
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     # Empty flag to check if statistics are available
     empty = True
 
-    # Parse date argument if provided
+    # Parse date or date range argument if provided
     if context.args and context.args[0].lower() == 'full':
         # If 'full' is specified, show statistics for all time
-        date = None
+        start = end = None
     elif context.args:
         try:
-            date = datetime.strptime(context.args[0], "%d-%m-%y").date()
+            first, _, last = context.args[0].partition('..')
+            start = datetime.strptime(first, "%d-%m-%y").date()
+            end = datetime.strptime(last, "%d-%m-%y").date() if last else start
+            if end < start:
+                raise ValueError("Range ends before it starts")
         except Exception:
             await update.message.reply_text(locales[current_locale]['statistics']['format'])
             return
     else:
-        date = datetime.now().date()
+        start = end = datetime.now().date()
 
-    if date:
-        stats = db.get_statistics(update.message.chat_id, date)
+    if start:
+        stats = await db.get_statistics_range(update.message.chat_id, start, end)
+        period = start.strftime("%d-%m-%Y")
+        if end != start:
+            period += " — " + end.strftime("%d-%m-%Y")
     else:
-        stats = db.get_statistics_full(update.message.chat_id)
-    msg = locales[current_locale]['statistics']['header'].format(date=(date.strftime("%d-%m-%Y") if date else "all time"))
+        stats = await db.get_statistics_full(update.message.chat_id)
+        period = "all time"
+    msg = locales[current_locale]['statistics']['header'].format(date=period)
     
     if stats['user_stats']:
         empty = False
@@ -752,7 +1091,7 @@ async def on_bot_added(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     
     if not update.message or not update.message.new_chat_members:
         await update.message.reply_text(locales[current_locale]['bot_add']['no_new'])
@@ -779,10 +1118,11 @@ async def on_bot_added(update: Update, context: CallbackContext) -> None:
                 locales[current_locale]['bot_add']['added']
             )
             
-            # Ensure chat exists in the database
-            db.ensure_chat_exists(update.message.chat_id, update.message.chat.title)
-            if not db.has_moderators(update.message.chat_id):
-                db.new_moderator(update.message.from_user.id, update.message.from_user.username, update.message.chat_id)
+            # Ensure chat exists in the database and stop a teardown still running from an earlier removal
+            await db.ensure_chat_exists(update.message.chat_id, update.message.chat.title)
+            await db.restore_chat(update.message.chat_id)
+            if not await db.has_moderators(update.message.chat_id):
+                await db.new_moderator(update.message.from_user.id, update.message.from_user.username, update.message.chat_id)
             
             # Log bot added event
             log_system_event(
@@ -804,7 +1144,12 @@ async def on_bot_removed(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     chat = update.effective_chat
-    db.delete_chat_and_moderators(chat.id)
+    left = update.message.left_chat_member if update.message else None
+    # LEFT_CHAT_MEMBER fires for every member leaving, not only the bot
+    if not left or left.id != context.bot.id:
+        return
+    # Deleting the chat's logs can take a while; run it in the background
+    context.application.create_task(db.delete_chat_and_moderators(chat.id), update=update)
     log_system_event(
         'bot_removed',
         {
@@ -823,7 +1168,7 @@ async def help_command(update: Update, context: CallbackContext) -> None:
         context (CallbackContext): Context for the callback
     """
     
-    current_locale = db.get_locale(update.effective_chat.id)
+    current_locale = await db.get_locale(update.effective_chat.id)
     help_short = locales[current_locale]['help']['help_short']
     locale_help = locales[current_locale]['help']['help_texts']
     
@@ -835,7 +1180,12 @@ async def help_command(update: Update, context: CallbackContext) -> None:
             f"/word ban <word> - {help_short['word_ban']}\n"
             f"/word unban <word> - {help_short['word_unban']}\n"
             f"/word list - {help_short['word_list']}\n"
-            f"/word clear - {help_short['word_clear']}\n\n"
+            f"/word clear - {help_short['word_clear']}\n"
+            f"**reply to file** /word import - {help_short['word_import']}\n"
+            f"/word normalize [basic|standard|strict] - {help_short['word_normalize']}\n"
+            f"/word fuzzy [0-{FUZZY_MAX_DISTANCE}] - {help_short['word_fuzzy']}\n"
+            f"/word subscribe [name] - {help_short['word_subscribe']}\n"
+            f"/word unsubscribe <name> - {help_short['word_unsubscribe']}\n\n"
             f"{help_short['mod_header']}\n"
             f"**reply to user** /mod add - {help_short['mod_add']}\n"
             f"**reply to user** /mod delete - {help_short['mod_delete']}\n"
@@ -851,7 +1201,7 @@ async def help_command(update: Update, context: CallbackContext) -> None:
             f"{help_short['other_header']}\n"
             f"/messages (optional)[timestamp] - {help_short['other_messages']}\n"
             f"/delete [on|off] - {help_short['other_delete']}\n"
-            f"/statistics (optional)[dd-mm-yy] - {help_short['other_statistics']}\n\n"
+            f"/statistics (optional)[dd-mm-yy|dd-mm-yy..dd-mm-yy|full] - {help_short['other_statistics']}\n\n"
             f"{help_short['other_help']}"
         )
         await update.message.reply_text(help_text)
@@ -879,11 +1229,11 @@ def get_command_help(command: str, locale_help: list, subcommand: str = None) ->
     help_texts = {
         "word": {
             None: locale_help['word']['none'].format(
-                help_template='\n/word ban <words> - Ban a word\n/word unban <words> - Remove banned word\n/word list - Show banned words\n/word clear - Clear all banned words'
+                help_template='\n/word ban <words> - Ban a word\n/word unban <words> - Remove banned word\n/word list - Show banned words\n/word clear - Clear all banned words\n**reply to file** /word import - Ban every word of a text file\n/word normalize [profile] - Show or set text normalization\n/word fuzzy [distance] - Show or set typo tolerance\n/word subscribe [name] - Subscribe to a shared blocklist\n/word unsubscribe <name> - Unsubscribe from a shared blocklist'
             ),
             "ban": locale_help['word']['ban'].format(
                 help_template='/word ban <words> - Ban a word',
-                help_ex='- /word ban badword\n- /word ban badword1 badword2'
+                help_ex='- /word ban badword\n- /word ban badword1 badword2\n- /word ban "bad phrase"\n- /word ban bad* (prefix), *bad (suffix), *bad* (anywhere)'
             ),
             "unban": locale_help['word']['unban'].format(
                 help_template='/word unban <words> - Remove banned word',
@@ -894,6 +1244,27 @@ def get_command_help(command: str, locale_help: list, subcommand: str = None) ->
             ),
             "clear": locale_help['word']['clear'].format(
                 help_template='/word clear - Clear all banned words'
+            ),
+            "import": locale_help['word']['import'].format(
+                help_template='**reply to file** /word import - Ban every word of a text file, one word or phrase per line'
+            ),
+            "normalize": locale_help['word']['normalize'].format(
+                help_template='/word normalize [basic|standard|strict] - Show or set text normalization',
+                help_ex='- /word normalize strict'
+            ),
+            "fuzzy": locale_help['word']['fuzzy'].format(
+                help_template=f'/word fuzzy [0-{FUZZY_MAX_DISTANCE}] - Show or set typo tolerance',
+                help_ex='- /word fuzzy 1\n- /word fuzzy 0',
+                length=FUZZY_MIN_LENGTH,
+                length2=FUZZY_MIN_LENGTH_2
+            ),
+            "subscribe": locale_help['word']['subscribe'].format(
+                help_template='/word subscribe [name] - Subscribe to a shared blocklist',
+                help_ex='- /word subscribe\n- /word subscribe profanity-en'
+            ),
+            "unsubscribe": locale_help['word']['unsubscribe'].format(
+                help_template='/word unsubscribe <name> - Unsubscribe from a shared blocklist',
+                help_ex='- /word unsubscribe profanity-en'
             )
         },
         "mod": {
@@ -959,8 +1330,8 @@ def get_command_help(command: str, locale_help: list, subcommand: str = None) ->
             help_ex='/delete on'
         ),
         "statistics": locale_help['statistics'].format(
-            help_template='/statistics (optional)[dd-mm-yy] - Show statistics for today or a given date',
-            help_ex='/statistics 20-03-24'
+            help_template='/statistics (optional)[dd-mm-yy|dd-mm-yy..dd-mm-yy|full] - Show statistics for today, a given date or a date range',
+            help_ex='/statistics 20-03-24, /statistics 01-10-26..15-10-26'
         )
     }
     
@@ -4,7 +4,13 @@ import logging
 from dotenv import load_dotenv
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 from utils.messages_migration_helper import load_from_db_to_json, load_from_json_to_db
+from utils.words_migration_helper import dedup_words
+from utils.logs_migration_helper import rekey_logs
 from utils import args as global_args
+from database import async_db
+from database.log_sink import get_log_sink
+from utils.logger import start_message_log_flusher, close_message_log
+from config.settings import CONCURRENT_UPDATES
 
 from handlers.commands import (
     check_message,
@@ -19,7 +25,9 @@ from handlers.commands import (
     on_bot_removed,
     locale_command,
     reinitialize_locales_command,
-    all_locales_command
+    all_locales_command,
+    cache_stats_command,
+    blocklist_command
 )
 
 # Load environment variables
@@ -32,6 +40,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def on_startup(application: Application) -> None:
+    """Seed in-memory state and start background tasks once the event loop is running."""
+    await async_db.load_known_chats()
+    start_message_log_flusher()
+    get_log_sink().start()
+    # Finish teardowns of chats the bot was removed from before the last shutdown
+    for chat_id in await async_db.pending_chat_teardowns():
+        application.create_task(async_db.resume_chat_teardown(chat_id))
+
+async def on_shutdown(application: Application) -> None:
+    """Flush pending logs and release database resources after the bot has stopped."""
+    await get_log_sink().drain()
+    close_message_log()
+    async_db.shutdown()
+
 def main() -> None:
     # Parse global arguments at startup
     args = global_args.parse_args()
@@ -46,13 +69,25 @@ def main() -> None:
     
     if args.migrate:
 
+        log_path = args.log_path or global_args.default_log_path(args.migrate)
         if args.migrate == "json":
-            load_from_json_to_db(log_path=args.log_path)
+            load_from_json_to_db(log_path=log_path, checkpoint_path=args.checkpoint)
         elif args.migrate == "db":
-            load_from_db_to_json(log_path=args.log_path)
+            load_from_db_to_json(log_path=log_path, since=args.since, until=args.until, chat_id=args.chat)
+        elif args.migrate == "words":
+            dedup_words()
+        elif args.migrate == "logs":
+            rekey_logs()
         return
     # Create the Application
-    application = Application.builder().token(os.getenv('TELEGRAM_BOT_API')).build()
+    application = (
+        Application.builder()
+        .token(os.getenv('TELEGRAM_BOT_API'))
+        .concurrent_updates(CONCURRENT_UPDATES)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
 
     # Add handlers
     application.add_handler(CommandHandler("word", word_command))
@@ -65,6 +100,8 @@ def main() -> None:
     application.add_handler(CommandHandler("locale", locale_command))
     application.add_handler(CommandHandler("reinitialize_locales", reinitialize_locales_command))
     application.add_handler(CommandHandler("all_locales", all_locales_command))
+    application.add_handler(CommandHandler("cache_stats", cache_stats_command))
+    application.add_handler(CommandHandler("blocklist", blocklist_command))
     
     
     # Handle new chat members (for bot being added to chat)
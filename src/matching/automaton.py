@@ -0,0 +1,75 @@
+from collections import deque
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over characters
+
+    Built once from a set of keys; scanning a text reports every occurrence
+    of every key in a single left-to-right pass, independent of the number of keys.
+
+    Args:
+        keys (iterable): Pairs of (key string, payload) to search for
+    """
+    def __init__(self, keys):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._link = [0]
+        for key, payload in keys:
+            self._insert(key, payload)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _insert(self, key: str, payload) -> None:
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._link.append(0)
+            node = nxt
+        self._out[node] += (payload,)
+
+    def _build_links(self) -> None:
+        """Compute failure links and output links breadth-first."""
+        goto, fail, out, link = self._goto, self._fail, self._out, self._link
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                # Nearest proper suffix that ends a key
+                link[child] = fail[child] if out[fail[child]] else link[fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, text: str):
+        """
+        Scan text for all keys
+
+        Args:
+            text (str): Text to scan
+
+        Yields:
+            tuple: (index of the last character of the match, payload)
+        """
+        goto, fail, out, link = self._goto, self._fail, self._out, self._link
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] else link[node]
+            while hit:
+                for payload in out[hit]:
+                    yield i, payload
+                hit = link[hit]
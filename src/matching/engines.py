@@ -0,0 +1,416 @@
+import os
+import re
+import abc
+import hashlib
+import threading
+import weakref
+from itertools import count
+from typing import Iterable, NamedTuple
+from matching.automaton import AhoCorasick
+from matching.symspell import DeletionIndex
+from matching.normalize import DEFAULT_PROFILE, Normalizer, get_normalizer
+from config.settings import FUZZY_MIN_LENGTHS
+
+# Everything that is not a word character or an apostrophe separates words
+_SEPARATORS = re.compile(r"[^\w']+")
+
+WILDCARD = '*'
+
+# Characters around whole words in prepared text
+WORD_BOUNDARIES = ' \n'
+
+# Word lists of common words that fuzzy matching never treats as typos, one word per line
+DICTIONARIES_DIR = os.path.join(os.path.dirname(__file__), "dictionaries")
+
+# Source of Matcher.version
+_versions = count(1)
+
+# Compiled matchers by content digest, shared by every chat with the same word list.
+# Entries disappear once no chat references the matcher any more.
+_shared_matchers = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+_common_words = None
+
+def prepare_text(text: str) -> str:
+    """
+    Lowercase text and collapse every run of separators into a single space
+
+    Args:
+        text (str): Raw message text or pattern
+
+    Returns:
+        str: Words separated by single spaces, without leading/trailing spaces
+    """
+    return _SEPARATORS.sub(' ', text.lower()).strip()
+
+class Pattern(NamedTuple):
+    """
+    Parsed banned word
+
+    Attributes:
+        word (str): Banned word as stored, reported on match
+        key (str): Prepared text searched for
+        whole_start (bool): Match must start at a word boundary
+        whole_end (bool): Match must end at a word boundary
+    """
+    word: str
+    key: str
+    whole_start: bool
+    whole_end: bool
+
+    @property
+    def is_plain(self) -> bool:
+        """Single whole word without wildcards."""
+        return self.whole_start and self.whole_end and ' ' not in self.key
+
+def has_inner_wildcard(word: str) -> bool:
+    """
+    Check whether a banned word has a wildcard anywhere but at its ends
+
+    Such words are rejected when banning; matching them as a prefix or
+    suffix pattern would silently turn `b*d` into the phrase `b d`.
+
+    Args:
+        word (str): Banned word
+
+    Returns:
+        bool: True if the word cannot be parsed into a pattern
+    """
+    return WILDCARD in word.strip(WILDCARD)
+
+def parse_pattern(word: str, normalize: Normalizer = None) -> Pattern | None:
+    """
+    Parse a banned word into a pattern
+
+    Supported forms:
+        - `word`: whole word
+        - `two words`: phrase, separators between words are ignored
+        - `word*`: word prefix (`bad*` matches `badly`)
+        - `*word`: word suffix
+        - `*word*`: substring anywhere inside words
+
+    Wildcards inside a word (`b*d`) are not supported, see has_inner_wildcard.
+
+    Args:
+        word (str): Banned word
+        normalize (Normalizer): Normalization applied to the key, same as for messages
+
+    Returns:
+        Pattern or None: Parsed pattern, None if nothing is left to match or the word has an inner wildcard
+    """
+    if has_inner_wildcard(word):
+        return None
+    core = word.lower()
+    whole_start = not core.startswith(WILDCARD)
+    whole_end = not core.endswith(WILDCARD)
+    core = core.strip(WILDCARD)
+    if normalize is not None:
+        core = normalize(core)
+    key = prepare_text(core)
+    if not key:
+        return None
+    return Pattern(word, key, whole_start, whole_end)
+
+class Matcher(abc.ABC):
+    """
+    Base class for compiled banned word matchers
+
+    Args:
+        words (Iterable[str]): Banned words
+        profile (str): Normalization profile applied to words and messages
+
+    Attributes:
+        version (int): Unique per compiled matcher; a different word list
+            is always a different matcher and so has a different version
+        distance (int): Edit distance tolerated by fuzzy matching, 0 for exact matching
+    """
+    engine = None
+    distance = 0
+
+    def __init__(self, words: Iterable[str], profile: str = DEFAULT_PROFILE):
+        self.words = frozenset(words)
+        self.profile = profile
+        self.normalize = get_normalizer(profile)
+        self.version = next(_versions)
+
+    def prepare(self, text: str) -> str:
+        """
+        Normalize text with the matcher's profile and collapse separators
+
+        Every reading of the text (see Normalizer.readings) goes on its own
+        line; line breaks end words and phrases just like spaces.
+        """
+        return '\n'.join(prepare_text(reading) for reading in self.normalize.readings(text))
+
+    @classmethod
+    def supports(cls, pattern: Pattern) -> bool:
+        """Check whether the engine can match the pattern."""
+        return True
+
+    def find(self, text: str) -> list[str]:
+        """
+        Find banned words in text
+
+        Args:
+            text (str): Message text
+
+        Returns:
+            list[str]: Matched banned words in order of first occurrence, without duplicates
+        """
+        return self.match(self.prepare(text))
+
+    @abc.abstractmethod
+    def match(self, text: str) -> list[str]:
+        """
+        Find banned words in text already passed through prepare()
+
+        Args:
+            text (str): Prepared message text
+
+        Returns:
+            list[str]: Matched banned words in order of first occurrence, without duplicates
+        """
+
+class SetMatcher(Matcher):
+    """
+    Whole-word matcher: splits the message into words and intersects with a set
+
+    Cost is O(words in message). Only plain words are supported.
+    """
+    engine = 'set'
+
+    def __init__(self, words: Iterable[str], profile: str = DEFAULT_PROFILE):
+        super().__init__(words, profile)
+        self._lookup = {}
+        for word in self.words:
+            pattern = parse_pattern(word, self.normalize)
+            if pattern:
+                self._lookup.setdefault(pattern.key, word)
+
+    @classmethod
+    def supports(cls, pattern: Pattern) -> bool:
+        return pattern.is_plain
+
+    def match(self, text: str) -> list[str]:
+        found = {}
+        for token in text.split():
+            word = self._lookup.get(token)
+            if word is not None:
+                found.setdefault(word, None)
+        return list(found)
+
+class AutomatonMatcher(Matcher):
+    """
+    Aho-Corasick matcher supporting whole words, phrases and wildcards
+
+    Cost is O(message length + matches) regardless of the number of banned words.
+    """
+    engine = 'automaton'
+
+    def __init__(self, words: Iterable[str], profile: str = DEFAULT_PROFILE):
+        super().__init__(words, profile)
+        patterns = (parse_pattern(word, self.normalize) for word in self.words)
+        self._automaton = AhoCorasick((p.key, p) for p in patterns if p)
+
+    def match(self, text: str) -> list[str]:
+        last = len(text) - 1
+        found = {}
+        for end, pattern in self._automaton.iter_matches(text):
+            if pattern.whole_end and end != last and text[end + 1] not in WORD_BOUNDARIES:
+                continue
+            start = end - len(pattern.key) + 1
+            if pattern.whole_start and start != 0 and text[start - 1] not in WORD_BOUNDARIES:
+                continue
+            found.setdefault(pattern.word, None)
+        return list(found)
+
+def get_common_words() -> frozenset:
+    """
+    Get the common words loaded from DICTIONARIES_DIR
+
+    Returns:
+        frozenset: Lowercase words of every *.txt file, comment lines excluded
+    """
+    global _common_words
+    if _common_words is None:
+        words = set()
+        if os.path.isdir(DICTIONARIES_DIR):
+            for name in sorted(os.listdir(DICTIONARIES_DIR)):
+                if not name.endswith(".txt"):
+                    continue
+                with open(os.path.join(DICTIONARIES_DIR, name), encoding='utf-8') as file:
+                    words.update(
+                        line.strip().lower() for line in file
+                        if line.strip() and not line.startswith('#')
+                    )
+        _common_words = frozenset(words)
+    return _common_words
+
+def fuzzy_distance(length: int, distance: int, min_lengths: tuple = FUZZY_MIN_LENGTHS) -> int:
+    """
+    Edit distance tolerated for a banned word of the given length
+
+    Short words are one edit away from many innocent words, so each extra
+    edit is only allowed from the matching entry of min_lengths on.
+
+    Args:
+        length (int): Length of the normalized banned word
+        distance (int): Largest distance chosen by the chat
+        min_lengths (tuple): Shortest word matched with 1, 2, ... typos
+
+    Returns:
+        int: Allowed distance, 0 if the word only matches exactly
+    """
+    return sum(1 for min_length in min_lengths[:distance] if length >= min_length)
+
+class FuzzyMatcher(Matcher):
+    """
+    Matcher that also finds single words misspelled by up to `distance` edits
+
+    Exact matching is delegated to the wrapped matcher. Plain words long
+    enough for at least one typo (see fuzzy_distance) are additionally put
+    into a deletion index built at compile time, so looking up a message
+    word costs a bounded number of dictionary probes regardless of the list
+    size. Message words found in the common word dictionaries are never
+    treated as typos. Matches are reported as the canonical banned word.
+
+    Args:
+        words (Iterable[str]): Banned words
+        profile (str): Normalization profile applied to words and messages
+        distance (int): Maximum edit distance of a misspelling (see matching.symspell)
+        min_lengths (tuple): Shortest word matched with 1, 2, ... typos
+        exact (Matcher): Compiled exact matcher of the same words and profile
+    """
+    engine = 'fuzzy'
+
+    def __init__(self, words: Iterable[str], profile: str = DEFAULT_PROFILE, distance: int = 1,
+                 min_lengths: tuple = FUZZY_MIN_LENGTHS, exact: Matcher = None):
+        super().__init__(words, profile)
+        self.distance = distance
+        self.min_lengths = tuple(min_lengths)
+        self._exact = exact or compile_matcher(self.words, AUTO_ENGINE, profile)
+        self._common = get_common_words()
+        patterns = (parse_pattern(word, self.normalize) for word in self.words)
+        self._index = DeletionIndex(
+            (p.key, p.word, fuzzy_distance(len(p.key), distance, self.min_lengths))
+            for p in patterns if p and p.is_plain
+        )
+
+    def match(self, text: str) -> list[str]:
+        found = dict.fromkeys(self._exact.match(text))
+        if not self._index:
+            return list(found)
+        seen = set()
+        for token in text.split():
+            if len(token) < self.min_lengths[0] or token in seen or token in self._common:
+                continue
+            seen.add(token)
+            word = self._index.lookup(token)
+            if word is not None:
+                found.setdefault(word, None)
+        return list(found)
+
+ENGINES = {
+    SetMatcher.engine: SetMatcher,
+    AutomatonMatcher.engine: AutomatonMatcher
+}
+
+# Picks the set engine for plain word lists and the automaton otherwise
+AUTO_ENGINE = 'auto'
+
+def compile_matcher(words: Iterable[str], engine: str = AUTO_ENGINE, profile: str = DEFAULT_PROFILE,
+                    distance: int = 0, min_lengths: tuple = FUZZY_MIN_LENGTHS) -> Matcher:
+    """
+    Compile banned words with the requested engine
+
+    Falls back to the automaton engine if the requested engine
+    cannot express some of the patterns (e.g. phrases with `set`).
+    With a distance, the result is wrapped in a FuzzyMatcher.
+
+    Args:
+        words (Iterable[str]): Banned words
+        engine (str): Engine name, one of ENGINES or AUTO_ENGINE
+        profile (str): Normalization profile, see matching.normalize
+        distance (int): Edit distance tolerated for single words, 0 for exact matching
+        min_lengths (tuple): Shortest word matched with 1, 2, ... typos
+
+    Returns:
+        Matcher: Compiled matcher
+
+    Raises:
+        ValueError: If the engine or profile is unknown
+    """
+    if engine == AUTO_ENGINE:
+        engine = SetMatcher.engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown matcher engine: {engine}")
+    words = frozenset(words)
+    normalize = get_normalizer(profile)
+    matcher_cls = ENGINES[engine]
+    patterns = (parse_pattern(word, normalize) for word in words)
+    if not all(matcher_cls.supports(p) for p in patterns if p):
+        matcher_cls = AutomatonMatcher
+    matcher = matcher_cls(words, profile)
+    if distance:
+        matcher = FuzzyMatcher(words, profile, distance, min_lengths, exact=matcher)
+    return matcher
+
+def matcher_digest(words: Iterable[str], engine: str = AUTO_ENGINE, profile: str = DEFAULT_PROFILE,
+                   distance: int = 0, min_lengths: tuple = FUZZY_MIN_LENGTHS) -> bytes:
+    """
+    Content digest of a word list as compiled by get_shared_matcher
+
+    Args:
+        words (Iterable[str]): Banned words
+        engine (str): Engine name, one of ENGINES or AUTO_ENGINE
+        profile (str): Normalization profile
+        distance (int): Fuzzy edit distance
+        min_lengths (tuple): Shortest word matched with 1, 2, ... typos
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest of the sorted words and compile options
+    """
+    options = f"{engine}\0{profile}\0{distance}\0{tuple(min_lengths)[:distance]}"
+    digest = hashlib.blake2b(options.encode(), digest_size=16)
+    for word in sorted(set(words)):
+        digest.update(b"\0" + word.encode())
+    return digest.digest()
+
+def get_shared_matcher(words: Iterable[str], engine: str = AUTO_ENGINE, profile: str = DEFAULT_PROFILE,
+                       distance: int = 0, min_lengths: tuple = FUZZY_MIN_LENGTHS) -> Matcher:
+    """
+    Get a compiled matcher shared by every caller with the same word list
+
+    Matchers are immutable, so chats with identical lists hold the same
+    object and memory scales with distinct lists rather than with chats.
+    A changed list simply compiles (or finds) another matcher.
+
+    Args:
+        words (Iterable[str]): Banned words
+        engine (str): Engine name, one of ENGINES or AUTO_ENGINE
+        profile (str): Normalization profile
+        distance (int): Edit distance tolerated for single words, 0 for exact matching
+        min_lengths (tuple): Shortest word matched with 1, 2, ... typos
+
+    Returns:
+        Matcher: Shared compiled matcher
+
+    Raises:
+        ValueError: If the engine or profile is unknown
+    """
+    words = frozenset(words)
+    key = matcher_digest(words, engine, profile, distance, min_lengths)
+    with _shared_lock:
+        matcher = _shared_matchers.get(key)
+    if matcher is not None:
+        return matcher
+    # Compiled outside the lock; if another thread won the race, its matcher is used
+    matcher = compile_matcher(words, engine, profile, distance, min_lengths)
+    with _shared_lock:
+        return _shared_matchers.setdefault(key, matcher)
+
+def shared_matcher_count() -> int:
+    """Number of distinct compiled matchers currently alive."""
+    with _shared_lock:
+        return len(_shared_matchers)
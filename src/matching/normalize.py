@@ -0,0 +1,146 @@
+import re
+import unicodedata
+
+# Text normalization profiles
+#
+# Applied to messages before matching and to banned words when a matcher is
+# compiled, so both sides are folded the same way:
+#   - basic: no folding (lowercasing and separators are handled by the engines)
+#   - standard: NFKC, diacritic folding, Cyrillic/Greek homoglyphs, invisible characters removed
+#   - strict: standard plus leetspeak digits, spaced-out letters joined (`b.a.d`)
+#     and runs of three or more repeated characters squeezed (`baaad`); doubled
+#     letters are kept so `ass` never becomes `as`
+# All character mappings of a profile are precomputed into one str.translate table.
+
+BASIC = 'basic'
+STANDARD = 'standard'
+STRICT = 'strict'
+PROFILES = (BASIC, STANDARD, STRICT)
+DEFAULT_PROFILE = BASIC
+
+# Soft hyphen, zero-width space/joiners, word joiner, BOM
+_INVISIBLE = '\u00ad\u200b\u200c\u200d\u2060\ufeff'
+
+# Letters that look like Latin ones
+_HOMOGLYPHS = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'і': 'i', 'ї': 'i', 'ј': 'j',
+    'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p', 'с': 'c', 'т': 't',
+    'у': 'y', 'х': 'x', 'ѕ': 's', 'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w',
+    # Greek
+    'α': 'a', 'β': 'b', 'γ': 'y', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k',
+    'ν': 'v', 'ο': 'o', 'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w'
+}
+
+# Digits and symbols used as letters
+_LEET = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b',
+    '@': 'a', '$': 's'
+}
+
+# Three or more single characters separated by the same non-word characters: `b.a.d`, `b a d`.
+# A neighbouring one-letter word with another separator is left alone (`a b.a.d`).
+_SPACED_LETTERS = re.compile(r"(?<![\w'])[\w']([^\w']+)[\w'](?![\w'])(?:\1[\w'](?![\w'])){1,}")
+_NON_WORD = re.compile(r"[^\w']+")
+# Three or more repeats of a character: emphasis, never part of a real word
+_REPEATS = re.compile(r"(.)\1{2,}")
+
+def _diacritics() -> dict:
+    """Map accented Latin letters to their base letter and drop combining marks."""
+    table = {}
+    for cp in list(range(0x00C0, 0x0250)) + list(range(0x1E00, 0x1F00)):
+        char = chr(cp)
+        base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        if base and base != char:
+            table[char] = base.lower()
+    for cp in range(0x0300, 0x0370):
+        table[chr(cp)] = None
+    return table
+
+def _build_table(profile: str) -> dict:
+    mapping = {char: None for char in _INVISIBLE}
+    mapping.update(_diacritics())
+    mapping.update(_HOMOGLYPHS)
+    if profile == STRICT:
+        mapping.update(_LEET)
+    return str.maketrans(mapping)
+
+class Normalizer:
+    """
+    Normalization pipeline of one profile
+
+    Args:
+        profile (str): One of PROFILES
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    def __init__(self, profile: str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown normalization profile: {profile}")
+        self.profile = profile
+        self._table = _build_table(profile) if profile != BASIC else None
+
+    def _fold(self, text: str) -> str:
+        text = unicodedata.normalize('NFKC', text).casefold().translate(self._table)
+        if self.profile == STRICT:
+            text = _SPACED_LETTERS.sub(lambda m: _NON_WORD.sub('', m.group()), text)
+        return text
+
+    def __call__(self, text: str) -> str:
+        """
+        Normalize text
+
+        Args:
+            text (str): Message text or banned word
+
+        Returns:
+            str: Normalized text
+        """
+        if self._table is None:
+            return text
+        text = self._fold(text)
+        if self.profile == STRICT:
+            text = _REPEATS.sub(r'\1\1', text)
+        return text
+
+    def readings(self, text: str) -> list[str]:
+        """
+        Normalize a message in every way it may spell a banned word
+
+        A run like `baaad` may stretch either a single or a doubled letter,
+        so the strict profile reads it both as `baad` and as `bad`.
+
+        Args:
+            text (str): Message text
+
+        Returns:
+            list[str]: Normalized text, followed by its single-letter reading if that differs
+        """
+        if self.profile != STRICT:
+            return [self(text)]
+        text = self._fold(text)
+        doubled = _REPEATS.sub(r'\1\1', text)
+        if doubled == text:
+            return [text]
+        return [doubled, _REPEATS.sub(r'\1', text)]
+
+_normalizers = {}
+
+def get_normalizer(profile: str = DEFAULT_PROFILE) -> Normalizer:
+    """
+    Get the shared normalizer of a profile, building its translate table on first use
+
+    Args:
+        profile (str): One of PROFILES
+
+    Returns:
+        Normalizer: Normalizer of the profile
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    normalizer = _normalizers.get(profile)
+    if normalizer is None:
+        normalizer = _normalizers[profile] = Normalizer(profile)
+    return normalizer
@@ -0,0 +1,126 @@
+def deletions(word: str, distance: int) -> set[str]:
+    """
+    Get every string obtained by deleting up to `distance` characters of word
+
+    Args:
+        word (str): Source string
+        distance (int): Maximum number of deleted characters
+
+    Returns:
+        set[str]: Deletion neighbourhood of word, word itself included
+    """
+    result = {word}
+    level = {word}
+    for _ in range(distance):
+        level = {variant[:i] + variant[i + 1:] for variant in level for i in range(len(variant))}
+        result |= level
+    return result
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance of two strings, giving up once it exceeds limit
+
+    Counts insertions, deletions, substitutions and swaps of adjacent
+    characters (optimal string alignment distance), so the common typo
+    "wrod" for "word" is one edit. Only a diagonal band of width
+    2 * limit + 1 is computed, so the cost is O(len(a) * limit).
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        limit (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    before = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        best = current[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j - 1] + cost, previous[j] + 1, current[j - 1] + 1, over)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return over
+        before, previous = previous, current
+    return previous[len(b)]
+
+class DeletionIndex:
+    """
+    SymSpell-style index for finding keys within a small edit distance
+
+    Every key is stored under all strings reachable by deleting up to its
+    own maximum distance of characters. Two strings within edit distance d
+    (see bounded_distance) always share a deletion of at most d characters
+    from each, so a lookup only generates the deletions of the query and
+    verifies the few candidates found; the cost depends on the query length
+    and the largest distance, not on the number of keys.
+
+    Args:
+        keys (iterable): Triples of (key string, payload, maximum distance for this key)
+    """
+    def __init__(self, keys):
+        self.distance = 0
+        self._index = {}
+        self.max_length = 0
+        # Shortest key stored with each distance
+        self._min_lengths = {}
+        for key, payload, distance in keys:
+            if distance < 1:
+                continue
+            self.distance = max(self.distance, distance)
+            self.max_length = max(self.max_length, len(key))
+            self._min_lengths[distance] = min(self._min_lengths.get(distance, len(key)), len(key))
+            for variant in deletions(key, distance):
+                self._index.setdefault(variant, []).append((key, payload, distance))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, query: str):
+        """
+        Find the payload of the key closest to query
+
+        Args:
+            query (str): String to look up
+
+        Returns:
+            Any: Payload of the closest key within that key's distance (ties go
+            to the lexicographically smallest key), None if there is none
+        """
+        if not self._index or len(query) > self.max_length + self.distance:
+            return None
+        # Only deletions deep enough for keys that could be in reach of the query
+        depth = max(
+            (d for d, length in self._min_lengths.items() if len(query) >= length - d),
+            default=0
+        )
+        if not depth:
+            return None
+        best = None
+        best_distance = self.distance + 1
+        checked = set()
+        for variant in deletions(query, depth):
+            for key, payload, limit in self._index.get(variant, ()):
+                # A key is stored under several of its deletions
+                if key in checked:
+                    continue
+                checked.add(key)
+                found = bounded_distance(query, key, limit)
+                if found > limit:
+                    continue
+                if best is None or found < best_distance or (found == best_distance and key < best[0]):
+                    best = (key, payload)
+                    best_distance = found
+        return best[1] if best else None
@@ -1,4 +1,7 @@
+import os
 import argparse
+from datetime import date, datetime
+from config.settings import LOG_DIR
 
 _parser = None
 _args = None
@@ -19,12 +22,55 @@ def get_parser() -> argparse.ArgumentParser:
         )
         _parser.add_argument(
             "--migrate",
-            choices=["json", "db"],
-            help="Migrate messages to 'json' or 'db'"
+            choices=["json", "db", "words", "logs"],
+            help="Migrate messages to 'json' or 'db', deduplicate banned words and add their unique index with 'words', "
+                 "or rekey the logs table by (chat_id, message_id) with 'logs'"
+        )
+        _parser.add_argument(
+            "--log-path",
+            default=None,
+            help="Directory with message log files used by --migrate; json reads <LOG_DIR>/messages "
+                 "and db exports into a new <LOG_DIR>/exports/<date_time> directory by default"
+        )
+        _parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Checkpoint file of --migrate json, defaults to <log-path>/migration.checkpoint"
+        )
+        _parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="First day (YYYY-MM-DD) exported by --migrate db"
+        )
+        _parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Last day (YYYY-MM-DD, inclusive) exported by --migrate db"
+        )
+        _parser.add_argument(
+            "--chat",
+            type=int,
+            help="Only export messages of this chat ID with --migrate db"
         )
         # Add more global arguments here if needed
     return _parser
 
+def default_log_path(migrate: str) -> str:
+    """Get the --log-path used when none is given.
+    
+    Exports never go to the live message log directory, whose files of the
+    current day are still being written.
+    
+    Args:
+        migrate (str): Value of --migrate
+    
+    Returns:
+        str: <LOG_DIR>/messages to import from, a fresh directory to export into for "db"
+    """
+    if migrate == "db":
+        return os.path.join(LOG_DIR, "exports", datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+    return os.path.join(LOG_DIR, "messages")
+
 def parse_args() -> argparse.Namespace:
     """Parse and return the global arguments.
     If the arguments have already been parsed, it returns the cached result.
@@ -0,0 +1,229 @@
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe bounded cache with least-recently-used eviction
+
+    Args:
+        maxsize (int): Maximum number of entries kept in the cache
+        ttl (float): Seconds after which an entry expires, None to keep entries until evicted
+    """
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, expiry time or None)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every write, so loads that raced with a write are not stored
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    def _lookup(self, key):
+        """Return the live value for key or _MISSING, dropping it if expired. Caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires = entry
+        if expires is not None and time.monotonic() >= expires:
+            del self._data[key]
+            return _MISSING
+        return value
+
+    def _store(self, key, value) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        """
+        Get a cached value and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Any: Cached value or default
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        """
+        Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._epoch += 1
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """
+        Get a cached value or load and store it on a miss
+
+        The loaded value is not stored if the cache was written to while
+        loading, so a slow read can never overwrite a newer write-through.
+
+        Args:
+            key: Cache key
+            loader: Callable returning the value for key
+
+        Returns:
+            Any: Cached or freshly loaded value
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            epoch = self._epoch
+        value = loader()
+        with self._lock:
+            if self._epoch == epoch:
+                self._store(key, value)
+        return value
+
+    @property
+    def epoch(self) -> int:
+        """Write counter; pass it to fill() to detect writes made while loading."""
+        return self._epoch
+
+    def fill(self, key, value, epoch: int) -> bool:
+        """
+        Store a value loaded from the source, unless the cache was written to since epoch
+
+        Args:
+            key: Cache key
+            value: Loaded value
+            epoch (int): Value of `epoch` read before loading
+
+        Returns:
+            bool: True if the value was stored
+        """
+        with self._lock:
+            if self._epoch != epoch:
+                return False
+            self._store(key, value)
+            return True
+
+    def peek(self, key, default=None):
+        """
+        Get a cached value without touching recency or counters
+
+        Args:
+            key: Cache key
+            default: Value returned if key is not cached
+
+        Returns:
+            Any: Cached value or default
+        """
+        with self._lock:
+            value = self._lookup(key)
+            return default if value is _MISSING else value
+
+    def replace(self, key, expected, value) -> bool:
+        """
+        Store value only if key still holds expected, otherwise drop the entry
+
+        Lets callers compute a new value outside the lock without
+        overwriting a concurrent change.
+
+        Args:
+            key: Cache key
+            expected: Value the new one was derived from
+            value: New value
+
+        Returns:
+            bool: True if the value was stored
+        """
+        with self._lock:
+            self._epoch += 1
+            if self._lookup(key) is expected:
+                self._store(key, value)
+                return True
+            self._data.pop(key, None)
+            return False
+
+    def pop(self, key, default=None):
+        """
+        Remove a key from the cache
+
+        Args:
+            key: Cache key
+            default: Value returned if key is not cached
+
+        Returns:
+            Any: Removed value or default
+        """
+        with self._lock:
+            self._epoch += 1
+            value = self._lookup(key)
+            self._data.pop(key, None)
+            return default if value is _MISSING else value
+
+    def pop_where(self, predicate) -> int:
+        """
+        Remove every entry whose key matches predicate
+
+        Args:
+            predicate: Callable receiving a key and returning True to remove it
+
+        Returns:
+            int: Number of removed entries
+        """
+        with self._lock:
+            self._epoch += 1
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits, misses, hit_ratio, size and maxsize
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
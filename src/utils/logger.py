@@ -1,11 +1,16 @@
 import os
 import json
+import asyncio
 import logging
-import database.db as db
 from datetime import datetime
 from typing import Dict, Any, Optional
 from logging.handlers import RotatingFileHandler
 from utils import args as global_args
+from utils.message_log import MessageLogWriter
+from config.settings import (
+    MESSAGE_LOG_BUFFER_SIZE, MESSAGE_LOG_FLUSH_INTERVAL, MESSAGE_LOG_FSYNC,
+    MESSAGE_LOG_FSYNC_INTERVAL, MESSAGE_LOG_ROTATE_SIZE, MESSAGE_LOG_ROTATE_WHEN
+)
 from telegram import Bot
 from telegram.ext import Application
 
@@ -34,6 +39,9 @@ system_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'
 system_handler.setFormatter(system_formatter)
 system_logger.addHandler(system_handler)
 
+_message_log = None
+_message_log_flusher = None
+
 def log_system_event(event_type: str, details: Dict[str, Any], level: str = 'INFO') -> None:
     """
     Logging system events
@@ -52,10 +60,66 @@ def log_system_event(event_type: str, details: Dict[str, Any], level: str = 'INF
     log_method = getattr(system_logger, level.lower())
     log_method(json.dumps(log_data))
 
+def get_message_log() -> MessageLogWriter:
+    """
+    Initialize and return the global message log writer.
+    If the writer is already initialized, it returns the existing instance.
+    
+    Returns:
+        MessageLogWriter: The message log writer instance.
+    """
+    global _message_log
+    if _message_log is None:
+        _message_log = MessageLogWriter(
+            LOG_DIR + "/messages",
+            buffer_size=MESSAGE_LOG_BUFFER_SIZE,
+            flush_interval=MESSAGE_LOG_FLUSH_INTERVAL,
+            fsync=MESSAGE_LOG_FSYNC,
+            fsync_interval=MESSAGE_LOG_FSYNC_INTERVAL,
+            max_bytes=MESSAGE_LOG_ROTATE_SIZE,
+            rotate_when=MESSAGE_LOG_ROTATE_WHEN
+        )
+    return _message_log
+
+async def _flush_message_log() -> None:
+    """Flush due message log lines in a worker thread, keeping file I/O and fsync off the event loop."""
+    await asyncio.get_running_loop().run_in_executor(None, get_message_log().flush, False)
+
+async def _flush_message_log_periodically() -> None:
+    """Flush buffered log lines even when no new messages arrive."""
+    while True:
+        await asyncio.sleep(MESSAGE_LOG_FLUSH_INTERVAL)
+        try:
+            await _flush_message_log()
+        except Exception as e:
+            log_system_event('message_log_flush_error', {'error': str(e)}, 'ERROR')
+
+def start_message_log_flusher() -> None:
+    """
+    Start the background task flushing the message log; requires a running event loop
+    """
+    global _message_log_flusher
+    if _message_log_flusher is None:
+        _message_log_flusher = asyncio.get_running_loop().create_task(_flush_message_log_periodically())
+
+def close_message_log() -> None:
+    """
+    Stop the flusher task, flush buffered lines and close the message log
+    """
+    global _message_log, _message_log_flusher
+    if _message_log_flusher is not None:
+        _message_log_flusher.cancel()
+        _message_log_flusher = None
+    if _message_log is not None:
+        _message_log.close()
+        _message_log = None
+
 async def log_message(message_data: Any, isMigrate: bool=False) -> None:
     """
     Logging user messages
     
+    Messages are appended to the line-delimited message log of the current period.
+    
     Args:
         message_data (Any): Message data, can be a single dictionary or a list of dictionaries
     """
@@ -67,31 +131,17 @@ async def log_message(message_data: Any, isMigrate: bool=False) -> None:
         elif not isinstance(message_data, list) or not all(isinstance(item, dict) for item in message_data):
             raise ValueError("message_data must be a dictionary or a list of dictionaries")
         
-        # Create file name based on date
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        log_file = f"messages_{date_str}.json"
-        log_path = os.path.join(LOG_DIR + "/messages", log_file)
+        from database.log_sink import get_log_sink
         
-        # Add timestamp to each message and save to database if applicable
+        # Add timestamp to each message and queue it for the database if applicable
         for message in message_data:
             message['timestamp'] = datetime.now().isoformat()
             if 'is_banned' in message:
-                db.add_message(message)
+                await get_log_sink().submit(message)
         
-        # Read existing data or create new file
-        if not isMigrate:
-            if os.path.exists(log_path):
-                with open(log_path, 'r+', encoding='utf-8') as file:
-                    try:
-                        file_data = json.load(file)
-                    except json.JSONDecodeError:
-                        file_data = {"messages": []}
-                    file_data["messages"].extend(message_data)
-                    file.seek(0)
-                    json.dump(file_data, file, indent=4, ensure_ascii=False)
-            else:
-                with open(log_path, 'w', encoding='utf-8') as file:
-                    json.dump({"messages": message_data}, file, indent=4, ensure_ascii=False)
+        # Append to the message log
+        if not isMigrate and get_message_log().write(message_data):
+            await _flush_message_log()
                 
         # Log successful message saving
         for message in message_data:
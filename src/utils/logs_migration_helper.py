@@ -0,0 +1,146 @@
+import time
+from database.db import execute_db_query, transaction
+from config.settings import MIGRATION_BATCH_SIZE, MIGRATION_PROGRESS_INTERVAL
+from utils.logger import log_system_event
+
+# Online rekey of `logs` to PRIMARY KEY (chat_id, message_id)
+#
+# 1. Create `logs_new` with the new keys.
+# 2. Add triggers mirroring inserts and deletes on `logs` into `logs_new`,
+#    so rows written by the running bot are not missed.
+# 3. Copy existing rows in batches along the old primary key.
+# 4. Swap the tables with one atomic RENAME and drop the triggers.
+#
+# The old table is kept as `logs_old` until it is dropped by hand.
+
+_COLUMNS = "user_id, username, message_text, chat_id, message_id, timestamp, banned_words"
+
+_CREATE_LOGS_NEW = """
+CREATE TABLE IF NOT EXISTS logs_new (
+  `user_id` bigint DEFAULT NULL,
+  `username` varchar(255) NOT NULL,
+  `message_text` text NOT NULL,
+  `chat_id` bigint NOT NULL,
+  `message_id` bigint NOT NULL,
+  `timestamp` timestamp NOT NULL,
+  `banned_words` json DEFAULT NULL,
+  PRIMARY KEY (`chat_id`,`message_id`),
+  KEY `chat_timestamp` (`chat_id`,`timestamp`),
+  KEY `timestamp_message` (`timestamp`,`message_id`),
+  FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+"""
+
+_TRIGGERS = {
+    "logs_rekey_insert": f"""
+        CREATE TRIGGER logs_rekey_insert AFTER INSERT ON logs FOR EACH ROW
+        INSERT IGNORE INTO logs_new ({_COLUMNS})
+        VALUES (NEW.user_id, NEW.username, NEW.message_text, NEW.chat_id, NEW.message_id, NEW.timestamp, NEW.banned_words)
+    """,
+    "logs_rekey_delete": """
+        CREATE TRIGGER logs_rekey_delete AFTER DELETE ON logs FOR EACH ROW
+        DELETE FROM logs_new WHERE chat_id = OLD.chat_id AND message_id = OLD.message_id
+    """
+}
+
+def _is_rekeyed() -> bool:
+    """Check whether `logs` already has the (chat_id, message_id) primary key."""
+    result = execute_db_query(
+        """
+        SELECT GROUP_CONCAT(column_name ORDER BY seq_in_index)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'logs' AND index_name = 'PRIMARY'
+        """,
+        fetch=True
+    )
+    return bool(result) and result[0][0] == "chat_id,message_id"
+
+def _drop_triggers() -> None:
+    for name in _TRIGGERS:
+        execute_db_query(f"DROP TRIGGER IF EXISTS {name}")
+
+def rekey_logs(batch_size: int = MIGRATION_BATCH_SIZE) -> None:
+    """
+    Rebuild `logs` with PRIMARY KEY (chat_id, message_id) and a (chat_id, timestamp) index
+    without stopping the bot.
+
+    Rows are copied in batches of `batch_size` along the old message_id key,
+    each batch in its own short statement, while triggers keep the copy in
+    sync with new and deleted rows. The run is idempotent: if it is
+    interrupted, start it again.
+
+    Args:
+        batch_size (int): Rows copied per statement.
+    """
+    try:
+        if _is_rekeyed():
+            # A previous run may have stopped between the swap and dropping the triggers
+            _drop_triggers()
+            log_system_event('migration_logs_skipped', {'reason': 'logs is already keyed by (chat_id, message_id)'}, 'INFO')
+            return
+
+        execute_db_query(_CREATE_LOGS_NEW)
+        _drop_triggers()
+        for ddl in _TRIGGERS.values():
+            execute_db_query(ddl)
+
+        started = time.monotonic()
+        last_report = started
+        after = -1
+        copied = 0
+        while True:
+            upper = execute_db_query(
+                """
+                SELECT MAX(message_id) FROM (
+                    SELECT message_id FROM logs WHERE message_id > %s ORDER BY message_id LIMIT %s
+                ) batch
+                """,
+                (after, batch_size),
+                fetch=True
+            )[0][0]
+            if upper is None:
+                break
+            # Rows without a chat cannot be keyed and are left behind in logs_old
+            with transaction() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT IGNORE INTO logs_new ({_COLUMNS})
+                    SELECT {_COLUMNS} FROM logs
+                    WHERE message_id > %s AND message_id <= %s AND chat_id IS NOT NULL
+                    """,
+                    (after, upper)
+                )
+                copied += cursor.rowcount
+            after = upper
+            now = time.monotonic()
+            if now - last_report >= MIGRATION_PROGRESS_INTERVAL:
+                last_report = now
+                log_system_event(
+                    'migration_progress_logs',
+                    {
+                        'last_message_id': after,
+                        'copied': copied,
+                        'rows_per_second': round(copied / (now - started), 1)
+                    },
+                    'INFO'
+                )
+
+        # Atomic swap: writers see either the old or the new table, never neither
+        execute_db_query("RENAME TABLE logs TO logs_old, logs_new TO logs")
+        _drop_triggers()
+        log_system_event(
+            'migration_success_logs',
+            {
+                'copied': copied,
+                'seconds': round(time.monotonic() - started, 1),
+                'note': 'The previous table is kept as logs_old; drop it once the bot runs fine'
+            },
+            'INFO'
+        )
+    except Exception as e:
+        log_system_event(
+            'migration_error_logs',
+            {'error': str(e)},
+            'ERROR'
+        )
+        raise e
@@ -0,0 +1,313 @@
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Any, Iterator
+
+# Append-only message log
+#
+# Messages are stored one JSON object per line in files named
+# `messages_<period>.jsonl`, with `messages_<period>.<n>.jsonl` parts added
+# when a file reaches its size limit. Legacy `messages_<date>.json` files
+# ({"messages": [...]}) can still be read with iter_messages().
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+ROTATE_PERIODS = {
+    "daily": "%Y-%m-%d",
+    "hourly": "%Y-%m-%d_%H"
+}
+
+_LOG_FILE_RE = re.compile(r"^messages_(?P<period>[\d_-]+)(?:\.(?P<part>\d+))?\.(?P<ext>jsonl|json)$")
+
+class MessageLogWriter:
+    """
+    Buffered writer for the line-delimited message log
+
+    write() only buffers lines and is cheap enough for the event loop.
+    flush() and close() do the file I/O, including fsync, and may block, so
+    async callers run them in an executor; writes keep being buffered while
+    a flush is in progress.
+
+    Args:
+        directory (str): Directory the log files are written to
+        buffer_size (int): Buffered bytes that make a flush due
+        flush_interval (float): Seconds after which buffered lines are due for a flush
+        fsync (str): "always" (fsync every flush), "interval" (at most every fsync_interval) or "never"
+        fsync_interval (float): Seconds between fsyncs for the "interval" policy
+        max_bytes (int): Size after which a new part file is started (0 disables)
+        rotate_when (str): Time-based rotation period, "daily" or "hourly"
+    """
+    def __init__(self, directory: str, buffer_size: int = 65536, flush_interval: float = 1.0,
+                 fsync: str = FSYNC_INTERVAL, fsync_interval: float = 1.0,
+                 max_bytes: int = 0, rotate_when: str = "daily"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        if rotate_when not in ROTATE_PERIODS:
+            raise ValueError(f"Unknown rotation period: {rotate_when}")
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.period_format = ROTATE_PERIODS[rotate_when]
+        # Guards the buffer only, so write() never waits for disk I/O
+        self._lock = threading.Lock()
+        # Serializes flushes, keeping lines in write order
+        self._io_lock = threading.Lock()
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._file = None
+        self._period = None
+        self._part = 0
+        self._last_flush = time.monotonic()
+        self._last_fsync = self._last_flush
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, period: str, part: int) -> str:
+        suffix = f".{part}" if part else ""
+        return os.path.join(self.directory, f"messages_{period}{suffix}.jsonl")
+
+    def _open(self, period: str) -> None:
+        """Open the newest part file of a period for appending."""
+        if self._file:
+            self._close_file()
+        part = 0
+        while os.path.exists(self._path(period, part + 1)):
+            part += 1
+        self._period = period
+        self._part = part
+        _drop_torn_line(self._path(period, part))
+        self._file = open(self._path(period, part), 'ab')
+
+    def _close_file(self) -> None:
+        self._file.flush()
+        if self.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def write(self, messages: list[dict]) -> bool:
+        """
+        Buffer messages for the log
+
+        Args:
+            messages (list[dict]): Messages to log, one line each
+
+        Returns:
+            bool: True if a flush is due (buffer full, flush interval passed or fsync "always")
+        """
+        lines = [
+            (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+            for message in messages
+        ]
+        with self._lock:
+            self._buffer.extend(lines)
+            self._buffered_bytes += sum(len(line) for line in lines)
+            return self._flush_due()
+
+    def _flush_due(self) -> bool:
+        return bool(self._buffer) and (
+            self._buffered_bytes >= self.buffer_size
+            or self.fsync == FSYNC_ALWAYS
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def _flush(self, force: bool = True) -> None:
+        """Write buffered lines, rotating by period and size; the caller holds _io_lock."""
+        with self._lock:
+            if not force and not self._flush_due():
+                return
+            now = time.monotonic()
+            self._last_flush = now
+            lines = self._buffer
+            self._buffer = []
+            self._buffered_bytes = 0
+        if not lines:
+            return
+        period = datetime.now().strftime(self.period_format)
+        if self._file is None or period != self._period:
+            self._open(period)
+        for line in lines:
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(line) > self.max_bytes:
+                self._close_file()
+                self._part += 1
+                self._file = open(self._path(self._period, self._part), 'ab')
+            self._file.write(line)
+        self._file.flush()
+        if self.fsync == FSYNC_ALWAYS or (
+            self.fsync == FSYNC_INTERVAL and now - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def flush(self, force: bool = True) -> None:
+        """
+        Flush buffered lines to disk; blocking
+
+        Args:
+            force (bool): Flush even if no flush is due yet
+        """
+        with self._io_lock:
+            self._flush(force)
+
+    def close(self) -> None:
+        """Flush buffered lines and close the current file; blocking."""
+        with self._io_lock:
+            self._flush()
+            if self._file:
+                self._close_file()
+
+def _drop_torn_line(path: str, chunk_size: int = 4096) -> None:
+    """Cut a half-written last line left by a crash, so only the last line of a log can be torn."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r+b') as file:
+        size = file.seek(0, os.SEEK_END)
+        if not size:
+            return
+        file.seek(size - 1)
+        if file.read(1) == b"\n":
+            return
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            file.seek(start)
+            newline = file.read(end - start).rfind(b"\n")
+            if newline != -1:
+                start += newline + 1
+                break
+            end = start
+        else:
+            start = 0
+        file.truncate(start)
+    from utils.logger import log_system_event
+    log_system_event('message_log_torn_line', {'file': path, 'dropped_bytes': size - start}, 'WARNING')
+
+def log_file_sort_key(file_name: str) -> tuple:
+    """
+    Sort key ordering log files by period, then part
+
+    Args:
+        file_name (str): Log file name
+
+    Returns:
+        tuple: (period, part, name)
+    """
+    match = _LOG_FILE_RE.match(file_name)
+    if not match:
+        return (file_name, 0, file_name)
+    return (match.group('period'), int(match.group('part') or 0), file_name)
+
+def list_log_files(directory: str) -> list[str]:
+    """
+    List message log files (legacy .json and .jsonl) in chronological order
+
+    Args:
+        directory (str): Directory with log files
+
+    Returns:
+        list[str]: Paths of log files
+    """
+    files = [
+        name for name in os.listdir(directory)
+        if (name.endswith('.json') or name.endswith('.jsonl'))
+        and os.path.isfile(os.path.join(directory, name))
+    ]
+    return [os.path.join(directory, name) for name in sorted(files, key=log_file_sort_key)]
+
+def iter_messages(path: str) -> Iterator[dict]:
+    """
+    Stream messages from a log file of either format
+
+    Args:
+        path (str): Path to a .jsonl or legacy .json log file
+
+    Yields:
+        dict: Logged messages in file order
+    """
+    if path.endswith('.jsonl'):
+        yield from _iter_jsonl(path)
+    else:
+        yield from _iter_legacy_json(path)
+
+def _iter_jsonl(path: str) -> Iterator[dict]:
+    """
+    Stream messages from a line-delimited log file
+
+    A crash can leave the last line half written, so an undecodable final
+    line is skipped with a warning. Anywhere else it means the file is
+    corrupt and stops the read.
+
+    Args:
+        path (str): Path to the .jsonl log file
+
+    Yields:
+        dict: Logged messages in file order
+
+    Raises:
+        ValueError: If a line other than the last one is not valid JSON
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        torn = None
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if torn is not None:
+                raise ValueError(f"{path}:{torn[0]}: corrupt log line: {torn[1]}")
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                torn = (number, e)
+        if torn is not None:
+            from utils.logger import log_system_event
+            log_system_event(
+                'message_log_torn_line',
+                {'file': path, 'line': torn[0], 'error': str(torn[1])},
+                'WARNING'
+            )
+
+def _iter_legacy_json(path: str, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Stream the items of the "messages" array of a legacy log file without loading it whole
+
+    Args:
+        path (str): Path to the legacy log file
+        chunk_size (int): Characters read at a time
+
+    Yields:
+        dict: Logged messages in file order
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as file:
+        buffer = ''
+        # Skip to the opening bracket of the messages array
+        while '[' not in buffer:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+        buffer = buffer[buffer.index('[') + 1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip(' \t\r\n,')
+            if buffer.startswith(']'):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    return
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield item
+            buffer = buffer[end:]
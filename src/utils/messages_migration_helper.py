@@ -1,53 +1,145 @@
-from database.db import add_message, show_messages_by_chat
+from database.db import add_messages, iter_logs
 import os
 import json
-from utils.logger import log_system_event, log_message
+import time
+from datetime import date, datetime, timedelta
+from config.settings import MIGRATION_BATCH_SIZE, MIGRATION_PROGRESS_INTERVAL
+from utils.logger import log_system_event
+from utils.message_log import list_log_files, iter_messages
 
-def load_from_json_to_db(log_path: str) -> None:
+CHECKPOINT_FILE = "migration.checkpoint"
+
+def _load_checkpoint(path: str) -> dict:
+    """
+    Read the JSON migration checkpoint
+    
+    Args:
+        path (str): Checkpoint file path
+    
+    Returns:
+        dict: Checkpoint with keys:
+            - done (list): Names of fully migrated files
+            - file (str): Name of the file being migrated, None if none
+            - position (int): Messages of that file already migrated
     """
-    Load messages from a JSON file into the database.
+    if not os.path.exists(path):
+        return {'done': [], 'file': None, 'position': 0}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def _save_checkpoint(path: str, checkpoint: dict) -> None:
+    """Atomically replace the checkpoint file, so a crash never leaves it half written."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+def load_from_json_to_db(log_path: str, checkpoint_path: str = None, batch_size: int = MIGRATION_BATCH_SIZE) -> None:
+    """
+    Load messages from the JSON/JSONL message logs in a directory into the database.
+    
+    Files are streamed message by message and inserted in batches of
+    `batch_size` rows, one transaction each. After every committed batch
+    the position is written to a checkpoint file, so an interrupted run
+    resumes where it stopped; the checkpoint is removed once all files are done.
+    Messages already in the database are skipped, so replaying a batch is harmless.
     
     Args:
-        file_path (str): Path to the JSON file.
+        log_path (str): Path to the directory with message log files.
+        checkpoint_path (str): Checkpoint file, defaults to `migration.checkpoint` in log_path.
+        batch_size (int): Messages inserted per transaction.
     """
     try:
-      if not os.path.exists(log_path): 
+        if not os.path.exists(log_path):
+            log_system_event(
+                'migration_error_json',
+                {'error': f"{log_path} does not exist."},
+                'ERROR'
+            )
+            return
+        
+        if not os.path.isdir(log_path):
+            log_system_event(
+                'migration_error_json',
+                {'error': f"{log_path} is not a directory."},
+                'ERROR'
+            )
+            return
+        
+        checkpoint_path = checkpoint_path or os.path.join(log_path, CHECKPOINT_FILE)
+        checkpoint = _load_checkpoint(checkpoint_path)
+        done = set(checkpoint['done'])
+        if checkpoint['done'] or checkpoint['file']:
+            log_system_event('migration_resumed_json', checkpoint, 'INFO')
+        
+        started = time.monotonic()
+        last_report = started
+        read = inserted = 0
+        
+        def flush(batch: list[dict], file_name: str, position: int) -> None:
+            nonlocal inserted, last_report
+            if batch:
+                inserted += add_messages(batch)
+                batch.clear()
+            checkpoint['file'] = file_name
+            checkpoint['position'] = position
+            _save_checkpoint(checkpoint_path, checkpoint)
+            now = time.monotonic()
+            if now - last_report >= MIGRATION_PROGRESS_INTERVAL:
+                last_report = now
+                log_system_event(
+                    'migration_progress_json',
+                    {
+                        'file': file_name,
+                        'read': read,
+                        'inserted': inserted,
+                        'rows_per_second': round(read / (now - started), 1)
+                    },
+                    'INFO'
+                )
+        
+        # Both legacy .json and line-delimited .jsonl files are streamed message by message
+        for file_path in list_log_files(log_path):
+            file_name = os.path.basename(file_path)
+            if file_name in done:
+                continue
+            skip = checkpoint['position'] if checkpoint['file'] == file_name else 0
+            batch = []
+            position = 0
+            for message in iter_messages(file_path):
+                position += 1
+                if position <= skip:
+                    continue
+                read += 1
+                if 'is_banned' in message:
+                    batch.append(message)
+                    if len(batch) >= batch_size:
+                        flush(batch, file_name, position)
+            flush(batch, file_name, position)
+            done.add(file_name)
+            checkpoint['done'].append(file_name)
+            checkpoint['file'] = None
+            checkpoint['position'] = 0
+            _save_checkpoint(checkpoint_path, checkpoint)
+        
+        # No checkpoint is written when there were no log files to migrate
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        elapsed = time.monotonic() - started
         log_system_event(
-            'migration_error_json',
-            {'error': f"{log_path} does not exist."},
-            'ERROR'
-        )
-        return
-      
-      if not os.path.isdir(log_path):
-        log_system_event(
-            'migration_error_json',
-            {'error': f"{log_path} is not a directory."},
-            'ERROR'
+            'migration_success_json',
+            {
+                'log_path': log_path,
+                'files': len(done),
+                'read': read,
+                'inserted': inserted,
+                'seconds': round(elapsed, 1),
+                'rows_per_second': round(read / elapsed, 1) if elapsed else read
+            },
+            'INFO'
         )
-        return
-      
-      files = sorted(os.listdir(log_path))
-      for file_name in files:
-        file_path = os.path.join(log_path, file_name)
-        if os.path.isfile(file_path) and file_name.endswith('.json'):
-          with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            for message in data.get('messages', []):
-              if 'is_banned' in message:
-                add_message(message)
-        else:
-          log_system_event(
-              'migration_error_json',
-              {'error': f"{file_path} is not a valid JSON file."},
-              'ERROR'
-          )
-          continue
-      log_system_event(
-          'migration_success_json',
-          {'file_path': file_path},
-          'INFO'
-      )
     except Exception as e:
         log_system_event(
             'migration_error_json',
@@ -56,47 +148,125 @@ def load_from_json_to_db(log_path: str) -> None:
         )
         raise e
       
-async def load_from_db_to_json(log_path: str) -> None:
+def _export_row(row: dict) -> dict:
+    """Convert a logs row to the message log line format read back by --migrate json."""
+    return {
+        'message_id': row['message_id'],
+        'chat_id': row['chat_id'],
+        'user_id': row['user_id'],
+        'username': row['username'],
+        'message_text': row['message_text'],
+        'timestamp': row['timestamp'].isoformat(),
+        'is_banned': True,
+        'banned_words': row['banned_words']
+    }
+
+def load_from_db_to_json(log_path: str, since: date = None, until: date = None, chat_id: int = None) -> None:
     """
-    Load messages from the database into a JSON file.
+    Export messages from the database into per-day JSONL files.
+    
+    Rows are streamed from a server-side cursor in timestamp order and
+    written to `messages_<YYYY-MM-DD>.jsonl` of the day they were logged,
+    so memory use does not depend on the table size. Existing files are
+    never overwritten: a directory that already holds message logs is
+    refused before anything is exported.
     
     Args:
-        log_path (str): Path to the directory where JSON files will be saved.
+        log_path (str): Path to the directory where JSONL files will be saved.
+        since (date): First day exported, None for no lower bound.
+        until (date): Last day exported (inclusive), None for no upper bound.
+        chat_id (int): Only export messages of this chat, None for all chats.
     """
     try:
-      if not os.path.isdir(log_path):
-        log_system_event(
-            'migration_error_json',
-            {'error': f"{log_path} is not a directory."},
-            'ERROR'
+        if os.path.exists(log_path) and not os.path.isdir(log_path):
+            log_system_event(
+                'migration_error_db',
+                {'error': f"{log_path} is not a directory."},
+                'ERROR'
+            )
+            return
+        
+        if os.path.isdir(log_path) and list_log_files(log_path):
+            log_system_event(
+                'migration_error_db',
+                {'error': f"{log_path} already contains message logs; export into an empty directory."},
+                'ERROR'
+            )
+            return
+        
+        if not os.path.exists(log_path):
+            os.makedirs(log_path)
+            log_system_event(
+                'migration_success_db',
+                {'log_path': f'Directory created: {log_path}'},
+                'INFO'
+            )
+        
+        rows = iter_logs(
+            since=datetime.combine(since, datetime.min.time()) if since else None,
+            until=datetime.combine(until + timedelta(days=1), datetime.min.time()) if until else None,
+            chat_id=chat_id,
+            batch_size=MIGRATION_BATCH_SIZE
         )
-        return
-      
-      if not os.path.exists(log_path):
-        os.makedirs(log_path)
+        started = time.monotonic()
+        last_report = started
+        exported = 0
+        files = 0
+        day = None
+        file = None
+        try:
+            for row in rows:
+                row_day = row['timestamp'].date()
+                if row_day != day:
+                    if file:
+                        file.close()
+                    day = row_day
+                    # "x" refuses to overwrite an existing log of the same day
+                    file = open(os.path.join(log_path, f"messages_{day.isoformat()}.jsonl"), 'x', encoding='utf-8')
+                    files += 1
+                file.write(json.dumps(_export_row(row), ensure_ascii=False) + "\n")
+                exported += 1
+                now = time.monotonic()
+                if now - last_report >= MIGRATION_PROGRESS_INTERVAL:
+                    last_report = now
+                    log_system_event(
+                        'migration_progress_db',
+                        {
+                            'day': day.isoformat(),
+                            'exported': exported,
+                            'rows_per_second': round(exported / (now - started), 1)
+                        },
+                        'INFO'
+                    )
+        finally:
+            rows.close()
+            if file:
+                file.close()
+        
+        if not exported:
+            log_system_event(
+                'migration_no_data',
+                {'log_path': log_path},
+                'INFO'
+            )
+            return
+        
+        elapsed = time.monotonic() - started
         log_system_event(
-            'migration_success_json',
-            {'log_path': f'Directory created: {log_path}'},
+            'migration_success_db',
+            {
+                'log_path': log_path,
+                'files': files,
+                'exported': exported,
+                'seconds': round(elapsed, 1),
+                'rows_per_second': round(exported / elapsed, 1) if elapsed else exported
+            },
             'INFO'
         )
-      
-      # Fetch messages from the database
-      messages = show_messages_by_chat()
-      
-      if not messages:
-        log_system_event(
-            'migration_no_data',
-            {'log_path': log_path},
-            'INFO'
-        )
-        return
-      
-      await log_message(messages, isMigrate=True)
-      
     except Exception as e:
         log_system_event(
             'migration_error_db',
             {'error': str(e), 'log_path': log_path},
             'ERROR'
         )
-        raise e
\ No newline at end of file
+        raise e
@@ -0,0 +1,98 @@
+from string import Formatter
+from config.settings import DEFAULT_TEMPLATE
+
+# Placeholders a warning template may use
+TEMPLATE_FIELDS = ('name', 'word')
+
+_formatter = Formatter()
+_default_template = None
+
+class TemplateError(ValueError):
+    """
+    Raised when a warning template cannot be compiled
+
+    Args:
+        message (str): Error description
+        placeholder (str): Offending placeholder as written, e.g. "{user}"
+    """
+    def __init__(self, message: str, placeholder: str = None):
+        super().__init__(message)
+        self.placeholder = placeholder
+
+class CompiledTemplate:
+    """
+    Warning template parsed into a render plan
+
+    The plan is a tuple of literal strings and placeholder names, so
+    rendering is a single join with no parsing and cannot fail.
+
+    Args:
+        text (str): Template as written by the moderator
+        parts (tuple): Literal strings and (field,) tuples in output order
+    """
+    __slots__ = ('text', 'parts', 'fields')
+
+    def __init__(self, text: str, parts: tuple):
+        self.text = text
+        self.parts = parts
+        self.fields = frozenset(part[0] for part in parts if isinstance(part, tuple))
+
+    def render(self, **values: str) -> str:
+        """
+        Render the template
+
+        Args:
+            **values: Placeholder values, only the used ones are required
+
+        Returns:
+            str: Warning text
+        """
+        return ''.join(part if isinstance(part, str) else values[part[0]] for part in self.parts)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.text!r})"
+
+def compile_template(text: str) -> CompiledTemplate:
+    """
+    Parse and validate a warning template
+
+    Only bare `{name}` and `{word}` placeholders are allowed;
+    literal braces are written as `{{` and `}}`.
+
+    Args:
+        text (str): Template text
+
+    Returns:
+        CompiledTemplate: Render plan of the template
+
+    Raises:
+        TemplateError: If the template has unknown or malformed placeholders
+    """
+    parts = []
+    try:
+        parsed = list(_formatter.parse(text))
+    except ValueError as e:
+        raise TemplateError(f"Malformed template: {e}") from e
+    for literal, field, format_spec, conversion in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        placeholder = "{" + field + ("!" + conversion if conversion else "") + (":" + format_spec if format_spec else "") + "}"
+        if field not in TEMPLATE_FIELDS or format_spec or conversion:
+            raise TemplateError(f"Unsupported placeholder: {placeholder}", placeholder)
+        parts.append((field,))
+    return CompiledTemplate(text, tuple(parts))
+
+def get_default_template() -> CompiledTemplate:
+    """
+    Initialize and return the compiled DEFAULT_TEMPLATE.
+    If the template is already compiled, it returns the existing instance.
+
+    Returns:
+        CompiledTemplate: The compiled default template.
+    """
+    global _default_template
+    if _default_template is None:
+        _default_template = compile_template(DEFAULT_TEMPLATE)
+    return _default_template
@@ -0,0 +1,55 @@
+import time
+from database.db import dedup_words_batch, has_words_unique_index, add_words_unique_index
+from config.settings import MIGRATION_PROGRESS_INTERVAL
+from utils.logger import log_system_event
+
+# Smaller than any chat ID (group chat IDs are negative)
+_MIN_CHAT_ID = -2 ** 63
+
+def dedup_words(batch_size: int = 100) -> None:
+    """
+    Remove duplicate banned words and add the unique (chat_id, word) index.
+
+    Duplicates are deleted a batch of chats at a time, each batch in its own
+    short transaction, so the bot can keep running. The index is then built
+    online; if new duplicates slipped in meanwhile, the run can simply be repeated.
+
+    Args:
+        batch_size (int): Chats deduplicated per transaction.
+    """
+    try:
+        if has_words_unique_index():
+            log_system_event('migration_words_skipped', {'reason': 'Unique index chat_word already exists'}, 'INFO')
+            return
+
+        started = time.monotonic()
+        last_report = started
+        after = _MIN_CHAT_ID
+        deleted = 0
+        while True:
+            after, batch_deleted = dedup_words_batch(after, batch_size)
+            if after is None:
+                break
+            deleted += batch_deleted
+            now = time.monotonic()
+            if now - last_report >= MIGRATION_PROGRESS_INTERVAL:
+                last_report = now
+                log_system_event(
+                    'migration_progress_words',
+                    {'last_chat_id': after, 'deleted': deleted},
+                    'INFO'
+                )
+
+        add_words_unique_index()
+        log_system_event(
+            'migration_success_words',
+            {'deleted': deleted, 'seconds': round(time.monotonic() - started, 1)},
+            'INFO'
+        )
+    except Exception as e:
+        log_system_event(
+            'migration_error_words',
+            {'error': str(e)},
+            'ERROR'
+        )
+        raise e
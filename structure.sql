@@ -15,6 +15,54 @@
 /*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
 /*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
 
+--
+-- Table structure for table `blocklist_words`
+--
+
+DROP TABLE IF EXISTS `blocklist_words`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `blocklist_words` (
+  `blocklist_id` int NOT NULL,
+  `word` varchar(255) NOT NULL,
+  PRIMARY KEY (`blocklist_id`,`word`),
+  CONSTRAINT `blocklist_words_ibfk_1` FOREIGN KEY (`blocklist_id`) REFERENCES `blocklists` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `blocklists`
+--
+
+DROP TABLE IF EXISTS `blocklists`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `blocklists` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `name` varchar(64) NOT NULL,
+  `created_by` bigint DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `name` (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `chat_blocklists`
+--
+
+DROP TABLE IF EXISTS `chat_blocklists`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `chat_blocklists` (
+  `chat_id` bigint NOT NULL,
+  `blocklist_id` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`blocklist_id`),
+  KEY `blocklist_id` (`blocklist_id`),
+  CONSTRAINT `chat_blocklists_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `chat_blocklists_ibfk_2` FOREIGN KEY (`blocklist_id`) REFERENCES `blocklists` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `chats`
 --
@@ -27,6 +75,9 @@ CREATE TABLE `chats` (
   `name` varchar(255) NOT NULL,
   `delete_messages` tinyint(1) DEFAULT '0',
   `locale` varchar(50) NOT NULL DEFAULT 'en',
+  `normalization` varchar(16) NOT NULL DEFAULT 'basic',
+  `fuzzy_distance` tinyint NOT NULL DEFAULT '0',
+  `removed_at` timestamp(6) NULL DEFAULT NULL,
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -42,13 +93,14 @@ CREATE TABLE `logs` (
   `user_id` bigint DEFAULT NULL,
   `username` varchar(255) NOT NULL,
   `message_text` text NOT NULL,
-  `chat_id` bigint DEFAULT NULL,
+  `chat_id` bigint NOT NULL,
   `message_id` bigint NOT NULL,
   `timestamp` timestamp NOT NULL,
   `banned_words` json DEFAULT NULL,
-  PRIMARY KEY (`message_id`),
-  KEY `chat_id` (`chat_id`),
-  CONSTRAINT `logs_ibfk_2` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+  PRIMARY KEY (`chat_id`,`message_id`),
+  KEY `chat_timestamp` (`chat_id`,`timestamp`),
+  KEY `timestamp_message` (`timestamp`,`message_id`),
+  CONSTRAINT `logs_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -70,6 +122,58 @@ CREATE TABLE `message_templates` (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `stats_daily_top_message`
+--
+
+DROP TABLE IF EXISTS `stats_daily_top_message`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `stats_daily_top_message` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `message_id` bigint NOT NULL,
+  `banned_count` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`),
+  CONSTRAINT `stats_daily_top_message_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `stats_daily_users`
+--
+
+DROP TABLE IF EXISTS `stats_daily_users`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `stats_daily_users` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `user_id` bigint NOT NULL,
+  `username` varchar(255) NOT NULL,
+  `messages` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`,`user_id`),
+  CONSTRAINT `stats_daily_users_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `stats_daily_words`
+--
+
+DROP TABLE IF EXISTS `stats_daily_words`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `stats_daily_words` (
+  `chat_id` bigint NOT NULL,
+  `day` date NOT NULL,
+  `word` varchar(255) NOT NULL,
+  `uses` int NOT NULL,
+  PRIMARY KEY (`chat_id`,`day`,`word`),
+  CONSTRAINT `stats_daily_words_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `user_is_moderator`
 --
@@ -114,6 +218,7 @@ CREATE TABLE `words` (
   `chat_id` bigint DEFAULT NULL,
   `who_banned` bigint DEFAULT NULL,
   PRIMARY KEY (`id`),
+  UNIQUE KEY `chat_word` (`chat_id`,`word`),
   KEY `chat_id` (`chat_id`),
   KEY `who_banned` (`who_banned`),
   CONSTRAINT `words_ibfk_1` FOREIGN KEY (`chat_id`) REFERENCES `chats` (`id`) ON DELETE CASCADE,
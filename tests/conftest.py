@@ -0,0 +1,15 @@
+import os
+import sys
+import shutil
+import tempfile
+
+# The bot runs from src/, so its packages are imported as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+# utils.logger creates its log files on import, before any fixture runs;
+# keep them out of the working tree
+_log_dir = tempfile.mkdtemp(prefix="test-logs-")
+os.environ["LOG_DIR"] = _log_dir
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_log_dir, ignore_errors=True)
@@ -0,0 +1,21 @@
+from database import db
+from database.db import Blocklist, ChatWords
+from matching.engines import ENGINES, Matcher
+
+def test_one_match_pass_per_message(monkeypatch):
+    blocklists = (Blocklist(1, "one", frozenset({"badword"})), Blocklist(2, "two", frozenset({"bad phrase"})))
+    matcher = db._combined_matcher(frozenset({"alpha"}), blocklists, "basic", 0)
+    monkeypatch.setattr(db, "get_chat_words", lambda chat_id: ChatWords(frozenset({"alpha"}), blocklists, matcher))
+    passes = []
+    for cls in ENGINES.values():
+        original = cls.match
+        monkeypatch.setattr(cls, "match", lambda self, text, original=original: passes.append(text) or original(self, text))
+    assert sorted(db.find_banned_words(-1, "alpha badword and a bad phrase")) == ["alpha", "bad phrase", "badword"]
+    assert len(passes) == 1
+
+def test_same_subscriptions_share_a_matcher():
+    blocklists = (Blocklist(1, "one", frozenset({"badword"})),)
+    first = db._combined_matcher(frozenset({"alpha"}), blocklists, "basic", 0)
+    assert isinstance(first, Matcher)
+    assert db._combined_matcher(frozenset({"alpha"}), blocklists, "basic", 0) is first
+    assert db._combined_matcher(frozenset({"beta"}), blocklists, "basic", 0) is not first
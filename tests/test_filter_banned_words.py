@@ -0,0 +1,23 @@
+import pytest
+from database import db
+from database.db import ChatWords
+from utils.cache import LRUCache
+
+STORED = frozenset({"cafe", "straße"})
+# What the utf8mb4_0900_ai_ci column matches for each queried word
+COLLATION_MATCHES = {"café": "cafe", "cafe": "cafe", "strasse": "straße", "straße": "straße"}
+
+@pytest.fixture(params=["cached", "sql"])
+def path(request, monkeypatch):
+    cache = LRUCache(10)
+    monkeypatch.setattr(db, "_banned_words_cache", cache)
+    if request.param == "cached":
+        cache.put(1, ChatWords(STORED, (), None))
+    def execute_db_query(query, params, fetch=False):
+        assert request.param == "sql"
+        return [(COLLATION_MATCHES[word],) for word in params[1:] if word in COLLATION_MATCHES]
+    monkeypatch.setattr(db, "execute_db_query", execute_db_query)
+    return request.param
+
+def test_both_paths_follow_the_collation(path):
+    assert db.filter_banned_words(1, ["Café", "STRASSE", "tea"]) == {"café", "strasse"}
@@ -0,0 +1,52 @@
+import pytest
+from matching.engines import compile_matcher, fuzzy_distance, get_common_words
+from matching.symspell import DeletionIndex, bounded_distance
+
+BANNED = ["whore", "bitch", "bastard", "badword"]
+
+def find(text, distance):
+    return compile_matcher(BANNED, distance=distance).find(text)
+
+@pytest.mark.parametrize("text", [
+    "where are you", "the whole thing", "those ones",
+    "pitch black", "a batch of cookies", "the witch",
+    "mustard and custard",
+])
+@pytest.mark.parametrize("distance", [1, 2])
+def test_common_words_are_not_typos(text, distance):
+    assert find(text, distance) == []
+
+@pytest.mark.parametrize("text, expected", [
+    ("you whoer", ["whore"]),
+    ("bicth", ["bitch"]),
+    ("what a badwrod", ["badword"]),
+    ("bastadr", ["bastard"]),
+])
+def test_one_typo_matches(text, expected):
+    assert find(text, 1) == expected
+
+def test_two_typos_need_long_words():
+    # 7 letters: only one typo allowed even at distance 2
+    assert find("bsatadr", 2) == []
+    assert find("bastadr", 2) == ["bastard"]
+    assert compile_matcher(["motherfucker"], distance=2).find("mothrefukcer") == ["motherfucker"]
+    assert compile_matcher(["motherfucker"], distance=1).find("mothrefukcer") == []
+
+def test_short_words_match_exactly():
+    assert compile_matcher(["shit"], distance=2).find("shot shift") == []
+    assert compile_matcher(["shit"], distance=2).find("shit") == ["shit"]
+
+def test_fuzzy_distance_scales_with_length():
+    assert [fuzzy_distance(n, 2, (5, 8)) for n in (4, 5, 7, 8, 12)] == [0, 1, 1, 2, 2]
+    assert fuzzy_distance(12, 1, (5, 8)) == 1
+
+def test_banned_common_word_still_matches_exactly():
+    assert "where" in get_common_words()
+    assert compile_matcher(["where"], distance=1).find("where") == ["where"]
+
+def test_deletion_index_respects_per_key_distance():
+    index = DeletionIndex([("abcde", "short", 1), ("abcdefgh", "long", 2)])
+    assert index.lookup("abxde") == "short"
+    assert index.lookup("axyde") is None
+    assert index.lookup("abxdefgy") == "long"
+    assert bounded_distance("wrod", "word", 1) == 1
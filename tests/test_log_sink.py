@@ -0,0 +1,38 @@
+import asyncio
+from mysql.connector import errors as mysql_errors
+from database.log_sink import LogSink
+
+class FakeDatabase:
+    """add_messages stand-in failing on rows of deleted chats and on scripted transient errors."""
+    def __init__(self, deleted_chats=(), transient_failures=0):
+        self.deleted_chats = set(deleted_chats)
+        self.transient_failures = transient_failures
+        self.rows = []
+        self.calls = 0
+
+    async def add_messages(self, batch):
+        self.calls += 1
+        if self.transient_failures:
+            self.transient_failures -= 1
+            raise mysql_errors.OperationalError("Lost connection to MySQL server")
+        if any(m["chat_id"] in self.deleted_chats for m in batch):
+            raise mysql_errors.IntegrityError("Cannot add or update a child row", errno=1452)
+        self.rows.extend(batch)
+        return len(batch)
+
+def write(database, batch):
+    sink = LogSink(database.add_messages, batch_size=500, flush_interval=1, max_queue=10, retry_delay=0)
+    asyncio.run(sink._write(batch))
+
+def test_bad_row_does_not_lose_batch():
+    database = FakeDatabase(deleted_chats={2})
+    batch = [{"chat_id": chat_id, "message_id": i} for i, chat_id in enumerate([1, 2, 3, 1])]
+    write(database, batch)
+    assert [m["chat_id"] for m in database.rows] == [1, 3, 1]
+
+def test_transient_errors_are_retried():
+    database = FakeDatabase(transient_failures=2)
+    batch = [{"chat_id": 1, "message_id": i} for i in range(3)]
+    write(database, batch)
+    assert database.rows == batch
+    assert database.calls == 3
@@ -0,0 +1,41 @@
+import json
+import pytest
+from utils.message_log import FSYNC_NEVER, MessageLogWriter, iter_messages, list_log_files
+
+def write_lines(path, *lines):
+    path.write_bytes(b"".join(lines))
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / "messages_2026-01-01.jsonl"
+    write_lines(path, b'{"a": 1}\n', b'{"a": 2}\n', b'{"a": 3')
+    assert list(iter_messages(str(path))) == [{"a": 1}, {"a": 2}]
+
+def test_corrupt_line_mid_file_raises(tmp_path):
+    path = tmp_path / "messages_2026-01-01.jsonl"
+    write_lines(path, b'{"a": 1}\n', b'garbage\n', b'{"a": 3}\n')
+    messages = iter_messages(str(path))
+    assert next(messages) == {"a": 1}
+    with pytest.raises(ValueError):
+        next(messages)
+
+def test_write_only_buffers(tmp_path):
+    writer = MessageLogWriter(str(tmp_path), buffer_size=1 << 20, flush_interval=3600, fsync=FSYNC_NEVER)
+    assert writer.write([{"a": 1}]) is False
+    assert list_log_files(str(tmp_path)) == []
+    assert writer.write([{"a": 2, "pad": "x" * (1 << 20)}]) is True
+    writer.flush(force=False)
+    [path] = list_log_files(str(tmp_path))
+    assert [m["a"] for m in iter_messages(path)] == [1, 2]
+    writer.close()
+
+def test_reopen_drops_torn_line(tmp_path):
+    writer = MessageLogWriter(str(tmp_path), fsync=FSYNC_NEVER)
+    writer.write([{"a": 1}])
+    writer.close()
+    [path] = list_log_files(str(tmp_path))
+    with open(path, 'ab') as file:
+        file.write(b'{"a": 2')
+    writer = MessageLogWriter(str(tmp_path), fsync=FSYNC_NEVER)
+    writer.write([{"a": 3}])
+    writer.close()
+    assert [m["a"] for m in iter_messages(path)] == [1, 3]
@@ -0,0 +1,14 @@
+import os
+from utils import args, messages_migration_helper
+
+def test_export_refuses_directory_with_logs(tmp_path, monkeypatch):
+    (tmp_path / "messages_2026-01-01.jsonl").write_text('{"a": 1}\n')
+    def iter_logs(**kwargs):
+        raise AssertionError("nothing may be exported")
+    monkeypatch.setattr(messages_migration_helper, "iter_logs", iter_logs)
+    messages_migration_helper.load_from_db_to_json(str(tmp_path))
+    assert os.listdir(tmp_path) == ["messages_2026-01-01.jsonl"]
+
+def test_export_defaults_to_fresh_directory():
+    assert args.default_log_path("json") == os.path.join(args.LOG_DIR, "messages")
+    assert os.path.dirname(args.default_log_path("db")) == os.path.join(args.LOG_DIR, "exports")
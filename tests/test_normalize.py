@@ -0,0 +1,48 @@
+import pytest
+from matching.engines import compile_matcher
+from matching.normalize import STRICT, get_normalizer
+
+def find(words, text):
+    return compile_matcher(words, profile=STRICT).find(text)
+
+@pytest.mark.parametrize("words, text", [
+    (["ass"], "as far as I know"),
+    (["kill"], "a kil switch"),
+    (["boobs"], "bobs and weaves"),
+])
+def test_doubled_letters_are_kept(words, text):
+    assert find(words, text) == []
+
+@pytest.mark.parametrize("words, text", [
+    (["ass"], "what an ass"),
+    (["ass"], "what an assssss"),
+    (["kill"], "kiiiiill them"),
+    (["bad"], "so baaaad"),
+    (["bad"], "b.a.a.a.d"),
+    (["bad word"], "baaad word"),
+    (["boobs"], "BOOOOBS"),
+])
+def test_stretched_letters_match(words, text):
+    assert find(words, text) == words
+
+@pytest.mark.parametrize("text, prepared", [
+    ("what a b.a.d word", "what a bad word"),
+    ("I b-a-d", "i bad"),
+])
+def test_spaced_letters_keep_one_letter_words(text, prepared):
+    matcher = compile_matcher(["bad"], profile=STRICT)
+    assert matcher.prepare(text) == prepared
+    assert matcher.find(text) == ["bad"]
+
+@pytest.mark.parametrize("engine", ["set", "automaton"])
+def test_readings_do_not_join_phrases(engine):
+    # "one bad" would only appear across the two readings of the message
+    matcher = compile_matcher(["one bad", "baad"], engine=engine, profile=STRICT)
+    assert matcher.prepare("baaad one") == "baad one\nbad one"
+    assert matcher.find("baaad one") == ["baad"]
+
+def test_readings():
+    normalize = get_normalizer(STRICT)
+    assert normalize("baaad") == "baad"
+    assert normalize.readings("kill") == ["kill"]
+    assert normalize.readings("baaad") == ["baad", "bad"]
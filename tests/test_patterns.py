@@ -0,0 +1,17 @@
+import pytest
+from matching.engines import Matcher, compile_matcher, has_inner_wildcard, parse_pattern
+
+@pytest.mark.parametrize("word, inner", [
+    ("bad", False), ("bad*", False), ("*bad", False), ("*bad*", False),
+    ("b*d", True), ("*b*d", True), ("bad w*rd", True),
+])
+def test_has_inner_wildcard(word, inner):
+    assert has_inner_wildcard(word) is inner
+
+def test_inner_wildcard_is_not_a_phrase():
+    assert parse_pattern("b*d") is None
+    assert compile_matcher(["b*d", "bad*"]).find("b d badly") == ["bad*"]
+
+def test_matcher_is_abstract():
+    with pytest.raises(TypeError):
+        Matcher(["bad"])